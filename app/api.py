@@ -0,0 +1,86 @@
+"""Plain HTTP endpoints served next to the Reflex event websocket."""
+
+from typing import Optional
+import base64
+import hashlib
+import hmac
+import logging
+import os
+import secrets
+import time
+
+import reflex as rx
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+from app.metrics import METRICS_ENABLED, render_prometheus
+from app.storage.exporter import EXPORT_FORMATS, export_filename, iter_export
+from app.storage.repository import get_repository
+
+EXPORT_TOKEN_TTL_SECONDS = 300
+SECRET_KEY = (
+    os.environ.get("COLLECTIONS_SECRET_KEY") or secrets.token_hex(32)
+).encode()
+if not os.environ.get("COLLECTIONS_SECRET_KEY") and rx.config.get_config().redis_url:
+    # Each worker would sign with its own random key.
+    logging.warning(
+        "COLLECTIONS_SECRET_KEY is not set: with multiple workers, export links "
+        "only work when the download reaches the worker that created them."
+    )
+
+
+def _sign(payload: str) -> str:
+    return hmac.new(SECRET_KEY, payload.encode(), hashlib.sha256).hexdigest()
+
+
+def create_export_token(user_email: str) -> str:
+    """Return a short-lived token authorizing an export of the user's data."""
+    expires = int(time.time()) + EXPORT_TOKEN_TTL_SECONDS
+    payload = f"{user_email}|{expires}"
+    token = f"{payload}|{_sign(payload)}"
+    return base64.urlsafe_b64encode(token.encode()).decode()
+
+
+def read_export_token(token: str) -> Optional[str]:
+    """Return the user email of a valid, unexpired token, or None."""
+    try:
+        user_email, expires, signature = (
+            base64.urlsafe_b64decode(token.encode()).decode().rsplit("|", 2)
+        )
+        expired = int(expires) < time.time()
+    except ValueError:
+        return None
+    if expired or not hmac.compare_digest(signature, _sign(f"{user_email}|{expires}")):
+        return None
+    return user_email
+
+
+async def export(request: Request):
+    user_email = read_export_token(request.query_params.get("token", ""))
+    if user_email is None:
+        return PlainTextResponse("Invalid or expired export link.", status_code=403)
+    file_format = request.query_params.get("format", "jsonl")
+    if file_format not in EXPORT_FORMATS:
+        return PlainTextResponse("Unsupported export format.", status_code=400)
+    compress = request.query_params.get("gzip") == "1"
+    filename = export_filename(file_format, compress)
+    # Starlette iterates sync generators in a thread pool, so the batched
+    # storage reads don't block the event loop.
+    return StreamingResponse(
+        iter_export(get_repository(), user_email, file_format, compress),
+        media_type="application/gzip" if compress else EXPORT_FORMATS[file_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+async def metrics(request: Request):
+    if not METRICS_ENABLED:
+        return PlainTextResponse("Metrics are disabled.", status_code=404)
+    return PlainTextResponse(
+        render_prometheus(), media_type="text/plain; version=0.0.4"
+    )
+
+
+api = Starlette(routes=[Route("/export", export), Route("/metrics", metrics)])
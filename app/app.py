@@ -10,11 +10,20 @@ from app.components.modals import (
     new_item_modal,
     edit_item_modal,
     delete_item_confirmation_modal,
+    import_items_modal,
 )
 from app.components.collection_detail_header import collection_detail_header
 from app.components.item_card import item_card
+from app.components.item_bulk_actions import item_bulk_actions
+from app.components.item_tag_facets import item_tag_facets, tag_suggestion_list
 from app.pages.login_page import login_page
 from app.pages.register_page import register_page
+from app.pages.search_page import search_page
+from app.pages.trash_page import trash_page
+from app.api import api
+from app.metrics import install as install_metrics
+from app.states.budget import install as install_state_budget
+from app.storage.tasks import purge_deleted, reconcile_item_counts
 
 
 def empty_state() -> rx.Component:
@@ -37,14 +46,45 @@ def empty_state() -> rx.Component:
     )
 
 
+def pager(has_previous, has_next, on_previous, on_next) -> rx.Component:
+    """Previous and next buttons for a paged grid, shown while other pages exist."""
+    button_class = "px-4 py-2 rounded-md border border-gray-300 bg-white text-sm font-semibold text-gray-700 hover:bg-gray-100 transition-colors disabled:opacity-50 disabled:pointer-events-none"
+    return rx.cond(
+        has_previous | has_next,
+        rx.el.div(
+            rx.el.button(
+                "Previous",
+                on_click=on_previous,
+                disabled=~has_previous,
+                class_name=button_class,
+            ),
+            rx.el.button(
+                "Next",
+                on_click=on_next,
+                disabled=~has_next,
+                class_name=button_class,
+            ),
+            class_name="flex justify-center gap-3 mt-8",
+        ),
+    )
+
+
 def collections_grid() -> rx.Component:
-    """The grid of all collections."""
+    """The visible page of collections."""
     return rx.el.div(
-        rx.foreach(
-            CollectionsState.filtered_collections,
-            lambda collection: collection_card(collection, key=collection["id"]),
+        rx.el.div(
+            rx.foreach(
+                CollectionsState.filtered_collections,
+                lambda collection: collection_card(collection, key=collection["id"]),
+            ),
+            class_name="grid grid-cols-1 sm:grid-cols-2 md:grid-cols-3 lg:grid-cols-4 gap-6",
+        ),
+        pager(
+            CollectionsState.collection_offset > 0,
+            CollectionsState.has_more_collections,
+            CollectionsState.previous_collections_page,
+            CollectionsState.next_collections_page,
         ),
-        class_name="grid grid-cols-1 sm:grid-cols-2 md:grid-cols-3 lg:grid-cols-4 gap-6",
     )
 
 
@@ -98,11 +138,20 @@ def item_empty_state() -> rx.Component:
 
 def items_grid() -> rx.Component:
     return rx.el.div(
-        rx.foreach(
-            CollectionsState.items_in_current_collection,
-            lambda item: item_card(item, key=item["id"]),
+        item_bulk_actions(),
+        rx.el.div(
+            rx.foreach(
+                CollectionsState.items_in_current_collection,
+                lambda item: item_card(item, key=item["id"]),
+            ),
+            class_name="grid grid-cols-1 sm:grid-cols-2 md:grid-cols-3 lg:grid-cols-4 gap-6 mt-8",
+        ),
+        pager(
+            CollectionsState.item_offset > 0,
+            CollectionsState.has_more_items,
+            CollectionsState.previous_items_page,
+            CollectionsState.next_items_page,
         ),
-        class_name="grid grid-cols-1 sm:grid-cols-2 md:grid-cols-3 lg:grid-cols-4 gap-6 mt-8",
     )
 
 
@@ -113,7 +162,12 @@ def collection_detail() -> rx.Component:
         rx.el.main(
             rx.el.div(
                 rx.cond(
-                    CollectionsState.items_in_current_collection.length() > 0,
+                    CollectionsState.tag_facets.length() > 0,
+                    item_tag_facets(),
+                ),
+                rx.cond(
+                    (CollectionsState.items_in_current_collection.length() > 0)
+                    | (CollectionsState.item_offset > 0),
                     items_grid(),
                     item_empty_state(),
                 ),
@@ -123,6 +177,8 @@ def collection_detail() -> rx.Component:
         new_item_modal(),
         edit_item_modal(),
         delete_item_confirmation_modal(),
+        import_items_modal(),
+        tag_suggestion_list(),
         global_hotkeys(),
         class_name="font-['Raleway'] bg-gray-50 min-h-screen text-gray-800",
     )
@@ -138,12 +194,39 @@ app = rx.App(
             rel="stylesheet",
         ),
     ],
+    api_transformer=api,
 )
+install_metrics(app, AuthState, CollectionsState)
+install_state_budget(AuthState, CollectionsState)
+app.register_lifespan_task(reconcile_item_counts)
+app.register_lifespan_task(purge_deleted)
 app.add_page(login_page, route="/login")
 app.add_page(register_page, route="/register")
-app.add_page(index, route="/", on_load=AuthState.check_auth)
+app.add_page(
+    index,
+    route="/",
+    on_load=[
+        AuthState.check_auth,
+        CollectionsState.migrate_local_storage,
+        CollectionsState.refresh_collections,
+    ],
+)
+app.add_page(
+    search_page,
+    route="/search",
+    on_load=[AuthState.check_auth, CollectionsState.refresh_collections],
+)
+app.add_page(
+    trash_page,
+    route="/trash",
+    on_load=[AuthState.check_auth, CollectionsState.load_trash],
+)
 app.add_page(
     collection_detail,
     route="/collections/[collection_id]",
-    on_load=[AuthState.check_auth, CollectionsState.on_detail_load],
+    on_load=[
+        AuthState.check_auth,
+        CollectionsState.migrate_local_storage,
+        CollectionsState.on_detail_load,
+    ],
 )
\ No newline at end of file
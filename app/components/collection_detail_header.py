@@ -41,6 +41,12 @@ def collection_detail_header() -> rx.Component:
                     ),
                     class_name="relative",
                 ),
+                rx.el.button(
+                    rx.icon("upload", class_name="h-4 w-4 mr-1.5"),
+                    "Import",
+                    on_click=CollectionsState.toggle_import_items_modal,
+                    class_name="flex items-center px-3 py-2 rounded-md text-sm text-gray-600 hover:bg-gray-100 hover:text-gray-800 transition-colors",
+                ),
                 rx.el.button(
                     rx.icon("plus", class_name="h-4 w-4 mr-1.5"),
                     "Add Item",
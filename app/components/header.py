@@ -20,12 +20,60 @@ def user_menu() -> rx.Component:
                 class_name="px-2 py-1.5 text-sm font-normal text-gray-500",
             ),
             rx.radix.dropdown_menu.separator(),
+            rx.radix.dropdown_menu.item("Trash", on_click=rx.redirect("/trash")),
+            rx.radix.dropdown_menu.item(
+                "Export as JSON Lines",
+                on_click=CollectionsState.export_data("jsonl"),
+            ),
+            rx.radix.dropdown_menu.item(
+                "Export items as CSV", on_click=CollectionsState.export_data("csv")
+            ),
+            rx.radix.dropdown_menu.separator(),
             rx.radix.dropdown_menu.item("Logout", on_click=AuthState.logout),
         ),
     )
 
 
-def header() -> rx.Component:
+def collection_search() -> rx.Component:
+    return rx.el.div(
+        rx.icon(
+            "search",
+            class_name="h-5 w-5 text-gray-400 absolute left-3 top-1/2 -translate-y-1/2",
+        ),
+        rx.el.input(
+            id="collection_search_input",
+            placeholder="Search collections...",
+            default_value=CollectionsState.search_query,
+            on_change=CollectionsState.set_search_query.debounce(300),
+            class_name="w-full max-w-sm pl-10 pr-10 py-2 rounded-md border border-gray-300 bg-white focus:ring-2 focus:ring-orange-500/50 focus:border-orange-500 transition-all text-sm",
+        ),
+        rx.el.kbd(
+            "⌘K",
+            class_name="absolute right-3 top-1/2 -translate-y-1/2 text-xs text-gray-400 bg-gray-100 px-1.5 py-0.5 rounded",
+        ),
+        class_name="relative",
+    )
+
+
+def new_collection_button() -> rx.Component:
+    return rx.el.button(
+        rx.icon("plus", class_name="h-4 w-4 mr-1.5"),
+        "New Collection",
+        rx.el.kbd(
+            "N",
+            class_name="ml-4 text-xs text-orange-200 bg-orange-600/50 px-1.5 py-0.5 rounded",
+        ),
+        on_click=CollectionsState.toggle_new_collection_modal,
+        class_name="flex items-center px-4 py-2 rounded-md bg-orange-500 text-white text-sm font-semibold hover:bg-orange-600 active:scale-98 transition-all shadow-sm bg-gradient-to-br from-orange-400 to-orange-600",
+    )
+
+
+def header(dashboard: bool = True) -> rx.Component:
+    """The top bar of every page but the collection detail page.
+
+    The collection search and the New Collection button only belong on the
+    dashboard, the page that lists collections and renders the modal.
+    """
     return rx.el.header(
         rx.el.div(
             rx.el.div(
@@ -43,38 +91,18 @@ def header() -> rx.Component:
                 class_name="flex items-center gap-2",
             ),
             rx.el.div(
-                rx.el.div(
-                    rx.icon(
-                        "search",
-                        class_name="h-5 w-5 text-gray-400 absolute left-3 top-1/2 -translate-y-1/2",
-                    ),
-                    rx.el.input(
-                        id="collection_search_input",
-                        placeholder="Search collections...",
-                        default_value=CollectionsState.search_query,
-                        on_change=CollectionsState.set_search_query.debounce(300),
-                        class_name="w-full max-w-sm pl-10 pr-10 py-2 rounded-md border border-gray-300 bg-white focus:ring-2 focus:ring-orange-500/50 focus:border-orange-500 transition-all text-sm",
-                    ),
-                    rx.el.kbd(
-                        "⌘K",
-                        class_name="absolute right-3 top-1/2 -translate-y-1/2 text-xs text-gray-400 bg-gray-100 px-1.5 py-0.5 rounded",
-                    ),
-                    class_name="relative",
-                ),
-                rx.el.button(
-                    rx.icon("plus", class_name="h-4 w-4 mr-1.5"),
-                    "New Collection",
-                    rx.el.kbd(
-                        "N",
-                        class_name="ml-4 text-xs text-orange-200 bg-orange-600/50 px-1.5 py-0.5 rounded",
-                    ),
-                    on_click=CollectionsState.toggle_new_collection_modal,
-                    class_name="flex items-center px-4 py-2 rounded-md bg-orange-500 text-white text-sm font-semibold hover:bg-orange-600 active:scale-98 transition-all shadow-sm bg-gradient-to-br from-orange-400 to-orange-600",
+                collection_search() if dashboard else rx.fragment(),
+                rx.el.a(
+                    rx.icon("text-search", class_name="h-4 w-4 mr-1.5"),
+                    "All Items",
+                    href="/search",
+                    class_name="flex items-center px-3 py-2 rounded-md text-sm text-gray-600 hover:bg-gray-100 hover:text-gray-800 transition-colors",
                 ),
+                new_collection_button() if dashboard else rx.fragment(),
                 user_menu(),
                 class_name="flex items-center gap-4",
             ),
             class_name="flex items-center justify-between",
         ),
         class_name="px-8 py-4 border-b border-gray-200 bg-white/80 backdrop-blur-md sticky top-0 z-40",
-    )
\ No newline at end of file
+    )
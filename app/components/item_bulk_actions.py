@@ -0,0 +1,63 @@
+import reflex as rx
+from app.states.collections_state import CollectionsState
+
+
+def item_bulk_actions() -> rx.Component:
+    """A toolbar for acting on every selected item at once."""
+    return rx.cond(
+        CollectionsState.selected_item_ids.length() > 0,
+        rx.el.div(
+            rx.el.span(
+                CollectionsState.selected_item_ids.length().to_string() + " selected",
+                class_name="text-sm font-semibold text-gray-700",
+            ),
+            rx.el.button(
+                "Select page",
+                on_click=CollectionsState.select_visible_items,
+                class_name="text-sm text-gray-600 hover:text-gray-800",
+            ),
+            rx.el.button(
+                "Clear",
+                on_click=CollectionsState.clear_item_selection,
+                class_name="text-sm text-gray-600 hover:text-gray-800",
+            ),
+            rx.el.div(class_name="flex-1"),
+            rx.el.select(
+                rx.el.option("Move to...", value="", disabled=True),
+                rx.foreach(
+                    CollectionsState.move_target_collections,
+                    lambda collection: rx.el.option(
+                        collection["name"], value=collection["id"]
+                    ),
+                ),
+                value="",
+                on_change=CollectionsState.bulk_move_items,
+                class_name="px-3 py-1.5 rounded-md border border-gray-300 bg-white text-sm",
+            ),
+            rx.el.input(
+                placeholder="Tags",
+                value=CollectionsState.bulk_tag,
+                on_change=CollectionsState.set_bulk_tag,
+                list="tag_suggestions",
+                auto_complete="off",
+                class_name="w-32 px-3 py-1.5 rounded-md border border-gray-300 bg-white text-sm",
+            ),
+            rx.el.button(
+                "Add tag",
+                on_click=CollectionsState.bulk_add_tag,
+                class_name="px-3 py-1.5 rounded-md border border-gray-300 bg-white text-sm font-semibold text-gray-700 hover:bg-gray-100",
+            ),
+            rx.el.button(
+                "Remove tag",
+                on_click=CollectionsState.bulk_remove_tag,
+                class_name="px-3 py-1.5 rounded-md border border-gray-300 bg-white text-sm font-semibold text-gray-700 hover:bg-gray-100",
+            ),
+            rx.el.button(
+                rx.icon("trash-2", class_name="h-4 w-4 mr-1.5"),
+                "Delete",
+                on_click=CollectionsState.bulk_delete_items,
+                class_name="flex items-center px-3 py-1.5 rounded-md bg-red-500 text-white text-sm font-semibold hover:bg-red-600",
+            ),
+            class_name="sticky top-4 z-10 flex flex-wrap items-center gap-3 mt-8 p-3 bg-white rounded-lg border border-gray-200 shadow-md",
+        ),
+    )
@@ -27,12 +27,26 @@ def item_menu(item: Item) -> rx.Component:
     )
 
 
+def item_select_box(item: Item) -> rx.Component:
+    """A checkbox that adds the item to the bulk selection."""
+    return rx.el.button(
+        rx.cond(
+            CollectionsState.selected_item_ids.contains(item["id"]),
+            rx.icon("square-check", class_name="h-6 w-6 text-orange-500"),
+            rx.icon("square", class_name="h-6 w-6 text-gray-400"),
+        ),
+        on_click=lambda: CollectionsState.toggle_item_selection(item["id"]),
+        title="Select",
+        class_name="rounded hover:bg-gray-100 transition-colors",
+    )
+
+
 def item_card(item: Item, **props) -> rx.Component:
     """A card that displays a single item."""
     return rx.el.div(
         rx.el.div(
             rx.el.div(
-                rx.icon("file-text", class_name="h-6 w-6 text-gray-400"),
+                item_select_box(item),
                 item_menu(item),
                 class_name="flex items-center justify-between mb-3",
             ),
@@ -46,15 +60,21 @@ def item_card(item: Item, **props) -> rx.Component:
             rx.el.div(
                 rx.foreach(
                     item["tags"],
-                    lambda tag: rx.el.span(
+                    lambda tag: rx.el.button(
                         tag,
-                        class_name="px-2 py-0.5 text-xs bg-gray-100 text-gray-600 rounded-full",
+                        on_click=lambda: CollectionsState.toggle_tag_filter(tag),
+                        title="Filter by this tag",
+                        class_name="px-2 py-0.5 text-xs bg-gray-100 text-gray-600 rounded-full hover:bg-gray-200",
                     ),
                 ),
                 class_name="flex flex-wrap gap-1 mt-3 h-6 overflow-hidden",
             ),
             class_name="p-4",
         ),
-        class_name="bg-white rounded-lg border border-gray-200 shadow-sm hover:shadow-lg hover:-translate-y-1 transition-all duration-300 ease-in-out flex flex-col h-48 group",
+        class_name=rx.cond(
+            CollectionsState.selected_item_ids.contains(item["id"]),
+            "bg-white rounded-lg border border-orange-400 ring-2 ring-orange-500/30 shadow-sm transition-all duration-300 ease-in-out flex flex-col h-48 group",
+            "bg-white rounded-lg border border-gray-200 shadow-sm hover:shadow-lg hover:-translate-y-1 transition-all duration-300 ease-in-out flex flex-col h-48 group",
+        ),
         **props,
     )
\ No newline at end of file
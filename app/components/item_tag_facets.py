@@ -0,0 +1,86 @@
+import reflex as rx
+from app.models import TagFacet
+from app.states.collections_state import CollectionsState
+
+
+def tag_suggestion_list() -> rx.Component:
+    """Autocomplete options shared by the tag inputs on the page."""
+    return rx.el.datalist(
+        rx.foreach(
+            CollectionsState.tag_suggestions,
+            lambda suggestion: rx.el.option(value=suggestion),
+        ),
+        id="tag_suggestions",
+    )
+
+
+def tag_facet(facet: TagFacet) -> rx.Component:
+    """A tag of the collection with its item count, toggling it as a filter."""
+    return rx.el.button(
+        facet["tag"],
+        rx.el.span(facet["count"], class_name="ml-1.5 text-xs opacity-70"),
+        on_click=lambda: CollectionsState.toggle_tag_filter(facet["tag"]),
+        class_name=rx.cond(
+            CollectionsState.selected_tags.contains(facet["tag"]),
+            "flex items-center px-2.5 py-1 text-sm rounded-full bg-orange-500 text-white",
+            "flex items-center px-2.5 py-1 text-sm rounded-full bg-gray-100 text-gray-600 hover:bg-gray-200",
+        ),
+    )
+
+
+def selected_tag(tag: str) -> rx.Component:
+    """An active tag filter, removed when clicked."""
+    return rx.el.button(
+        tag,
+        rx.icon("x", class_name="h-3 w-3 ml-1"),
+        on_click=lambda: CollectionsState.toggle_tag_filter(tag),
+        class_name="flex items-center px-2.5 py-1 text-sm rounded-full bg-orange-500 text-white",
+    )
+
+
+def item_tag_facets() -> rx.Component:
+    """Filters the visible items by their tags."""
+    return rx.el.div(
+        rx.el.div(
+            rx.el.form(
+                rx.el.input(
+                    name="tag",
+                    placeholder="Filter by tag...",
+                    list="tag_suggestions",
+                    auto_complete="off",
+                    on_change=CollectionsState.set_tag_input.debounce(150),
+                    class_name="w-40 px-3 py-1.5 rounded-md border border-gray-300 bg-white text-sm",
+                ),
+                on_submit=CollectionsState.handle_tag_filter_submit,
+                reset_on_submit=True,
+            ),
+            rx.foreach(CollectionsState.selected_tags, selected_tag),
+            rx.cond(
+                CollectionsState.selected_tags.length() > 1,
+                rx.el.button(
+                    rx.cond(
+                        CollectionsState.tag_match_all,
+                        "Matching all",
+                        "Matching any",
+                    ),
+                    on_click=CollectionsState.toggle_tag_match_mode,
+                    title="Switch between items with all of these tags and with any",
+                    class_name="text-sm font-semibold text-gray-600 hover:text-gray-800",
+                ),
+            ),
+            rx.cond(
+                CollectionsState.selected_tags.length() > 0,
+                rx.el.button(
+                    "Clear",
+                    on_click=CollectionsState.clear_tag_filters,
+                    class_name="text-sm text-gray-600 hover:text-gray-800",
+                ),
+            ),
+            class_name="flex flex-wrap items-center gap-2",
+        ),
+        rx.el.div(
+            rx.foreach(CollectionsState.tag_facets, tag_facet),
+            class_name="flex flex-wrap gap-2 mt-3",
+        ),
+        class_name="mb-2",
+    )
@@ -162,7 +162,7 @@ def delete_collection_confirmation_modal() -> rx.Component:
             ),
             rx.el.div(
                 rx.el.p(
-                    "Are you sure you want to delete this collection and all its items? This action cannot be undone.",
+                    "Are you sure you want to delete this collection and all its items? You can restore them from the trash.",
                     class_name="text-gray-600 text-sm py-6",
                 ),
                 rx.el.div(
@@ -243,6 +243,9 @@ def item_form(submit_handler, item: rx.Var[dict], button_text: str) -> rx.Compon
                     placeholder="logo, png, primary",
                     default_value=rx.cond(item, item["tags"].join(", "), ""),
                     key=CollectionsState.editing_item.to_string(),
+                    list="tag_suggestions",
+                    auto_complete="off",
+                    on_change=CollectionsState.set_tag_input.debounce(150),
                     class_name="w-full px-3 py-2 rounded-md border border-gray-300 focus:ring-2 focus:ring-orange-500/50 focus:border-orange-500 transition-shadow",
                 ),
                 class_name="space-y-1",
@@ -334,7 +337,7 @@ def delete_item_confirmation_modal() -> rx.Component:
             ),
             rx.el.div(
                 rx.el.p(
-                    "Are you sure you want to delete this item? This action cannot be undone.",
+                    "Are you sure you want to delete this item? You can restore it from the trash.",
                     class_name="text-gray-600 text-sm py-6",
                 ),
                 rx.el.div(
@@ -364,4 +367,77 @@ def delete_item_confirmation_modal() -> rx.Component:
         ),
         open=CollectionsState.is_delete_item_modal_open,
         on_open_change=CollectionsState.close_delete_item_modal,
-    )
\ No newline at end of file
+    )
+
+
+def import_items_modal() -> rx.Component:
+    """Modal for bulk importing items from a CSV, JSON Lines or JSON file."""
+    return rx.radix.primitives.dialog.root(
+        rx.radix.primitives.dialog.content(
+            rx.radix.primitives.dialog.title(
+                "Import Items", class_name="text-xl font-semibold text-gray-900"
+            ),
+            rx.el.div(
+                rx.el.p(
+                    "Upload a CSV with name, description and tags columns, a JSON Lines file with one item object per line, or a JSON array of item objects.",
+                    class_name="text-gray-600 text-sm",
+                ),
+                rx.upload.root(
+                    rx.el.div(
+                        rx.icon("upload", class_name="h-8 w-8 text-gray-400"),
+                        rx.el.p(
+                            "Drop a file here or click to choose",
+                            class_name="text-sm text-gray-500 mt-2",
+                        ),
+                        rx.foreach(
+                            rx.selected_files("item_import_upload"),
+                            lambda name: rx.el.p(
+                                name, class_name="text-sm font-medium text-gray-700 mt-1"
+                            ),
+                        ),
+                        class_name="flex flex-col items-center justify-center p-6",
+                    ),
+                    id="item_import_upload",
+                    accept={
+                        "text/csv": [".csv"],
+                        "application/x-ndjson": [".jsonl", ".ndjson"],
+                        "application/json": [".json"],
+                    },
+                    max_files=1,
+                    class_name="border border-dashed border-gray-300 rounded-lg bg-gray-50 hover:bg-gray-100 transition-colors cursor-pointer",
+                ),
+                rx.foreach(
+                    CollectionsState.import_errors,
+                    lambda error: rx.el.p(error, class_name="text-xs text-red-600"),
+                ),
+                class_name="py-6 space-y-4",
+            ),
+            rx.el.div(
+                rx.el.button(
+                    "Cancel",
+                    on_click=CollectionsState.toggle_import_items_modal,
+                    class_name="px-4 py-2 rounded-md border border-gray-300 bg-white text-sm font-semibold text-gray-700 hover:bg-gray-50 active:scale-98 transition-all",
+                    type="button",
+                ),
+                rx.el.button(
+                    "Import",
+                    on_click=CollectionsState.handle_import_items(
+                        rx.upload_files(upload_id="item_import_upload")
+                    ),
+                    class_name="px-4 py-2 rounded-md bg-orange-500 text-white text-sm font-semibold hover:bg-orange-600 active:scale-98 transition-all shadow-sm bg-gradient-to-br from-orange-400 to-orange-600",
+                    type="button",
+                ),
+                class_name="flex justify-end gap-3 pt-4 border-t border-gray-200",
+            ),
+            rx.radix.primitives.dialog.close(
+                rx.el.button(
+                    rx.icon("x", class_name="h-5 w-5"),
+                    class_name="p-1 rounded-full hover:bg-gray-100 transition-colors absolute top-3 right-3",
+                    type="button",
+                )
+            ),
+            class_name="bg-white rounded-xl shadow-2xl w-full max-w-md p-6 relative",
+        ),
+        open=CollectionsState.is_import_items_modal_open,
+        on_open_change=CollectionsState.toggle_import_items_modal,
+    )
@@ -0,0 +1,196 @@
+"""Per event handler and per computed var latency and payload metrics.
+
+Enabled with ``COLLECTIONS_METRICS``: ``prometheus`` serves the totals as
+Prometheus text at ``/metrics``, ``log`` additionally writes one JSON line
+per observation to the ``app.metrics`` logger. When unset nothing is
+installed, so handlers and vars run without any added work.
+
+``/metrics`` also reports the hit and miss counters of the partition cache,
+which should show one miss per write to a partition rather than one per read,
+and of the item index cache along with how many items its indexes hold.
+"""
+
+from typing import Any
+import bisect
+import functools
+import inspect
+import json
+import logging
+import os
+import time
+
+import reflex as rx
+from reflex.middleware import Middleware
+from reflex.utils.format import json_dumps
+
+from app.storage.cache import index_cache, partition_cache
+
+METRICS_MODE = os.environ.get("COLLECTIONS_METRICS", "")
+METRICS_ENABLED = METRICS_MODE in ("prometheus", "log")
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+logger = logging.getLogger("app.metrics")
+
+
+class Metric:
+    """Invocation count, latency histogram and payload bytes of one handler or var."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.bytes = 0
+        self.buckets = [0] * len(BUCKETS)
+
+    def observe(self, seconds: float, size: int):
+        self.count += 1
+        self.seconds += seconds
+        self.bytes += size
+        index = bisect.bisect_left(BUCKETS, seconds)
+        if index < len(BUCKETS):
+            self.buckets[index] += 1
+
+
+# (kind, name) -> Metric, where kind is "event" or "var".
+_metrics: dict[tuple[str, str], Metric] = {}
+
+
+def observe(kind: str, name: str, seconds: float, size: int = 0):
+    """Record one event handler run or computed var evaluation."""
+    metric = _metrics.get((kind, name))
+    if metric is None:
+        metric = _metrics[(kind, name)] = Metric()
+    metric.observe(seconds, size)
+    if METRICS_MODE == "log":
+        logger.info(
+            json.dumps(
+                {"kind": kind, "name": name, "ms": round(seconds * 1000, 3), "bytes": size}
+            )
+        )
+
+
+def _short_event_name(name: str) -> str:
+    """``...___collections_state.delete_item`` -> ``collections_state.delete_item``."""
+    state, _, handler = name.rpartition(".")
+    return f"{state.rpartition('____')[2]}.{handler}"
+
+
+def _payload_size(value: Any) -> int:
+    return len(json_dumps(value))
+
+
+class MetricsMiddleware(Middleware):
+    """Time each event from dispatch to its final update and sum its delta sizes."""
+
+    def __init__(self):
+        # id(event) -> (start time, delta bytes so far)
+        self._pending: dict[int, tuple[float, int]] = {}
+
+    async def preprocess(self, app, state, event) -> None:
+        self._pending[id(event)] = (time.perf_counter(), 0)
+        return None
+
+    async def postprocess(self, app, state, event, update):
+        start, size = self._pending.get(id(event), (time.perf_counter(), 0))
+        size += _payload_size(update.delta) if update.delta else 0
+        if not update.final:
+            self._pending[id(event)] = (start, size)
+            return update
+        self._pending.pop(id(event), None)
+        observe("event", _short_event_name(event.name), time.perf_counter() - start, size)
+        return update
+
+
+def _timed_fget(name: str, fget, measure_size: bool):
+    if inspect.iscoroutinefunction(fget):
+
+        @functools.wraps(fget)
+        async def async_wrapper(state):
+            start = time.perf_counter()
+            value = await fget(state)
+            size = _payload_size(value) if measure_size else 0
+            observe("var", name, time.perf_counter() - start, size)
+            return value
+
+        return async_wrapper
+
+    @functools.wraps(fget)
+    def wrapper(state):
+        start = time.perf_counter()
+        value = fget(state)
+        size = _payload_size(value) if measure_size else 0
+        observe("var", name, time.perf_counter() - start, size)
+        return value
+
+    return wrapper
+
+
+def instrument_computed_vars(state_cls: type[rx.State]):
+    """Time every computed var of a state, and size the ones sent to the client."""
+    for var_name, var in state_cls.computed_vars.items():
+        name = f"{state_cls.get_name().rpartition('____')[2]}.{var_name}"
+        timed = _timed_fget(name, var._fget, measure_size=not var._backend)
+        # The registry entry and the class descriptor can be distinct copies.
+        for copy in {id(v): v for v in (var, state_cls.__dict__.get(var_name))}.values():
+            if copy is not None:
+                object.__setattr__(copy, "_fget", timed)
+
+
+def install(app: rx.App, *state_classes: type[rx.State]):
+    """Instrument the app's events and the given states' vars, if enabled."""
+    if not METRICS_ENABLED:
+        return
+    app.add_middleware(MetricsMiddleware())
+    for state_cls in state_classes:
+        instrument_computed_vars(state_cls)
+
+
+def render_prometheus() -> str:
+    """Format the collected metrics in the Prometheus text exposition format."""
+    lines = []
+    for kind in ("event", "var"):
+        prefix = f"collections_{kind}"
+        label = "handler" if kind == "event" else "var"
+        lines += [
+            f"# HELP {prefix}_duration_seconds Time spent per {kind}.",
+            f"# TYPE {prefix}_duration_seconds histogram",
+        ]
+        sizes = []
+        for (metric_kind, name), metric in sorted(_metrics.items()):
+            if metric_kind != kind:
+                continue
+            labels = f'{label}="{name}"'
+            cumulative = 0
+            for bound, count in zip(BUCKETS, metric.buckets):
+                cumulative += count
+                lines.append(
+                    f'{prefix}_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}'
+                )
+            lines += [
+                f'{prefix}_duration_seconds_bucket{{{labels},le="+Inf"}} {metric.count}',
+                f"{prefix}_duration_seconds_sum{{{labels}}} {metric.seconds:.6f}",
+                f"{prefix}_duration_seconds_count{{{labels}}} {metric.count}",
+            ]
+            sizes.append(f"{prefix}_payload_bytes_total{{{labels}}} {metric.bytes}")
+        lines += [
+            f"# HELP {prefix}_payload_bytes_total Serialized "
+            + ("delta bytes sent per event." if kind == "event" else "value bytes per var."),
+            f"# TYPE {prefix}_payload_bytes_total counter",
+            *sizes,
+        ]
+    for name, cache in (("partition", partition_cache), ("index", index_cache)):
+        stats = cache.stats()
+        series = [
+            ("hits_total", "counter", stats["hits"], "Lookups served from the cache."),
+            ("misses_total", "counter", stats["misses"], "Lookups loaded from storage."),
+            ("entries", "gauge", stats["entries"], "Values held in the cache."),
+        ]
+        if cache.weigh:
+            series.append(("items", "gauge", stats["weight"], "Items held in the cache."))
+        for metric, kind, value, help_text in series:
+            lines += [
+                f"# HELP collections_{name}_cache_{metric} {help_text}",
+                f"# TYPE collections_{name}_cache_{metric} {kind}",
+                f"collections_{name}_cache_{metric} {value}",
+            ]
+    return "\n".join(lines) + "\n"
+
@@ -0,0 +1,45 @@
+from typing import TypedDict, Literal
+
+Color = Literal["orange", "blue", "green", "purple", "pink", "gray"]
+
+
+class Item(TypedDict):
+    id: str
+    name: str
+    description: str
+    tags: list[str]
+    collection_id: str
+    created_at: str
+    updated_at: str
+
+
+class Collection(TypedDict):
+    id: str
+    name: str
+    description: str
+    color: Color
+    item_count: int
+    updated_at: str
+
+
+class TagFacet(TypedDict):
+    tag: str
+    count: int
+
+
+class SearchHit(TypedDict):
+    id: str
+    name: str
+    description: str
+    tags: list[str]
+    collection_id: str
+    collection_name: str
+    collection_color: Color
+
+
+class TrashEntry(TypedDict):
+    id: str
+    kind: Literal["collection", "item"]
+    name: str
+    detail: str
+    deleted_at: str
@@ -0,0 +1,91 @@
+import reflex as rx
+from app.models import SearchHit
+from app.states.collections_state import CollectionsState
+from app.components.header import header
+
+
+def search_hit_card(hit: SearchHit, **props) -> rx.Component:
+    """A row showing one search result and the collection it belongs to."""
+    return rx.el.div(
+        rx.el.div(
+            rx.el.span(
+                class_name=rx.match(
+                    hit["collection_color"],
+                    ("orange", "h-2.5 w-2.5 rounded-full bg-orange-500"),
+                    ("blue", "h-2.5 w-2.5 rounded-full bg-blue-500"),
+                    ("green", "h-2.5 w-2.5 rounded-full bg-green-500"),
+                    ("purple", "h-2.5 w-2.5 rounded-full bg-purple-500"),
+                    ("pink", "h-2.5 w-2.5 rounded-full bg-pink-500"),
+                    ("gray", "h-2.5 w-2.5 rounded-full bg-gray-500"),
+                    "h-2.5 w-2.5 rounded-full bg-gray-500",
+                )
+            ),
+            rx.el.span(hit["collection_name"], class_name="text-xs text-gray-500"),
+            class_name="flex items-center gap-2",
+        ),
+        rx.el.h3(hit["name"], class_name="font-semibold text-gray-800 truncate mt-1"),
+        rx.el.p(hit["description"], class_name="text-gray-500 text-sm truncate"),
+        rx.el.div(
+            rx.foreach(
+                hit["tags"],
+                lambda tag: rx.el.span(
+                    tag,
+                    class_name="px-2 py-0.5 text-xs bg-gray-100 text-gray-600 rounded-full",
+                ),
+            ),
+            class_name="flex flex-wrap gap-1 mt-2",
+        ),
+        on_click=lambda: CollectionsState.go_to_collection(hit["collection_id"]),
+        class_name="p-4 bg-white rounded-lg border border-gray-200 shadow-sm hover:shadow-md transition-all cursor-pointer",
+        **props,
+    )
+
+
+def search_page() -> rx.Component:
+    """The page for searching items across all collections."""
+    return rx.el.div(
+        header(dashboard=False),
+        rx.el.main(
+            rx.el.div(
+                rx.el.div(
+                    rx.icon(
+                        "search",
+                        class_name="h-5 w-5 text-gray-400 absolute left-3 top-1/2 -translate-y-1/2",
+                    ),
+                    rx.el.input(
+                        id="global_search_input",
+                        placeholder="Search items in all collections...",
+                        default_value=CollectionsState.global_search_query,
+                        on_change=CollectionsState.set_global_search_query.debounce(
+                            300
+                        ),
+                        auto_focus=True,
+                        class_name="w-full pl-10 pr-4 py-3 rounded-md border border-gray-300 bg-white focus:ring-2 focus:ring-orange-500/50 focus:border-orange-500 transition-all",
+                    ),
+                    class_name="relative",
+                ),
+                rx.cond(
+                    CollectionsState.global_search_results.length() > 0,
+                    rx.el.div(
+                        rx.foreach(
+                            CollectionsState.global_search_results,
+                            lambda hit: search_hit_card(hit, key=hit["id"]),
+                        ),
+                        class_name="flex flex-col gap-3 mt-6",
+                    ),
+                    rx.cond(
+                        CollectionsState.global_search_query != "",
+                        rx.el.p(
+                            "No items match your search.",
+                            class_name="text-gray-500 text-center mt-12",
+                        ),
+                    ),
+                ),
+                class_name="p-8 max-w-3xl mx-auto",
+            )
+        ),
+        rx.window_event_listener(
+            on_key_down=CollectionsState.handle_key_down, event="keydown"
+        ),
+        class_name="font-['Raleway'] bg-gray-50 min-h-screen text-gray-800",
+    )
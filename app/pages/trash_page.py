@@ -0,0 +1,59 @@
+import reflex as rx
+from app.models import TrashEntry
+from app.states.collections_state import CollectionsState
+from app.components.header import header
+
+
+def trash_entry_row(entry: TrashEntry, **props) -> rx.Component:
+    """A row showing one trashed collection or item with a restore button."""
+    return rx.el.div(
+        rx.icon(
+            rx.cond(entry["kind"] == "collection", "folder", "file-text"),
+            class_name="h-5 w-5 text-gray-400 shrink-0",
+        ),
+        rx.el.div(
+            rx.el.h3(entry["name"], class_name="font-semibold text-gray-800 truncate"),
+            rx.el.p(entry["detail"], class_name="text-gray-500 text-sm truncate"),
+            class_name="flex-1 min-w-0",
+        ),
+        rx.el.button(
+            rx.icon("rotate-ccw", class_name="h-4 w-4 mr-1.5"),
+            "Restore",
+            on_click=lambda: CollectionsState.restore_from_trash(entry),
+            class_name="flex items-center px-3 py-1.5 rounded-md border border-gray-300 bg-white text-sm font-semibold text-gray-700 hover:bg-gray-100 transition-colors",
+        ),
+        class_name="flex items-center gap-4 p-4 bg-white rounded-lg border border-gray-200 shadow-sm",
+        **props,
+    )
+
+
+def trash_page() -> rx.Component:
+    """The page listing deleted collections and items that can be restored."""
+    return rx.el.div(
+        header(dashboard=False),
+        rx.el.main(
+            rx.el.div(
+                rx.el.h2("Trash", class_name="text-xl font-semibold text-gray-800"),
+                rx.el.p(
+                    "Deleted collections and items are kept here until they are purged.",
+                    class_name="text-gray-500 text-sm mt-1",
+                ),
+                rx.cond(
+                    CollectionsState.trash_entries.length() > 0,
+                    rx.el.div(
+                        rx.foreach(
+                            CollectionsState.trash_entries,
+                            lambda entry: trash_entry_row(entry, key=entry["id"]),
+                        ),
+                        class_name="flex flex-col gap-3 mt-6",
+                    ),
+                    rx.el.p(
+                        "The trash is empty.",
+                        class_name="text-gray-500 text-center mt-12",
+                    ),
+                ),
+                class_name="p-8 max-w-3xl mx-auto",
+            )
+        ),
+        class_name="font-['Raleway'] bg-gray-50 min-h-screen text-gray-800",
+    )
@@ -1,69 +1,40 @@
 import reflex as rx
-from typing import TypedDict, Optional
-import hashlib
-import json
+import asyncio
 import re
+from datetime import datetime, timezone
 
-
-class User(TypedDict):
-    email: str
-    password_hash: str
-
-
-class Session(TypedDict):
-    email: str
+from app.storage.accounts import (
+    end_session,
+    hash_password,
+    session_email,
+    start_session,
+    verify_password,
+)
+from app.storage.repository import get_repository
 
 
 class AuthState(rx.State):
-    """Manages user authentication, registration, and session state."""
+    """Manages user authentication, registration, and session state.
 
-    users_json: str = rx.LocalStorage("[]", name="auth_users")
-    session_json: str = rx.LocalStorage("", name="auth_session")
-
-    @rx.var
-    def users(self) -> list[User]:
-        """Get the list of users from local storage."""
-        try:
-            return json.loads(self.users_json)
-        except json.JSONDecodeError as e:
-            import logging
+    Accounts and sessions live in the repository. The browser only keeps the
+    session token, and the user is whoever the repository says it belongs
+    to, so nothing the client sends can name another account.
+    """
 
-            logging.exception(f"Error decoding users_json: {e}")
-            return []
-
-    def _save_users(self, users: list[User]):
-        """Save the list of users to local storage."""
-        self.users_json = json.dumps(users)
+    session_token: str = rx.LocalStorage("", name="auth_token")
 
     @rx.var
-    def session(self) -> Optional[Session]:
-        """Get the current session from local storage."""
-        if not self.session_json:
-            return None
-        try:
-            return json.loads(self.session_json)
-        except json.JSONDecodeError as e:
-            import logging
-
-            logging.exception(f"Error decoding session_json: {e}")
-            return None
+    def current_user_email(self) -> str:
+        """Get the email of the currently logged-in user."""
+        return session_email(get_repository(), self.session_token) or ""
 
     @rx.var
     def is_authenticated(self) -> bool:
         """Check if the user is authenticated."""
-        return self.session is not None
-
-    @rx.var
-    def current_user_email(self) -> str:
-        """Get the email of the currently logged-in user."""
-        return self.session["email"] if self.session else ""
-
-    def _hash_password(self, password: str) -> str:
-        """Hash a password using SHA256."""
-        return hashlib.sha256(password.encode()).hexdigest()
+        return self.current_user_email != ""
 
     @rx.event
-    def register(self, form_data: dict):
+    async def register(self, form_data: dict):
         """Register a new user."""
         email = form_data.get("email", "").strip().lower()
         password = form_data.get("password", "")
@@ -76,37 +47,54 @@ class AuthState(rx.State):
             return rx.toast.error("Passwords do not match.")
         if len(password) < 8:
             return rx.toast.error("Password must be at least 8 characters long.")
-        if any((u["email"] == email for u in self.users)):
+        password_hash = await asyncio.to_thread(hash_password, password)
+        now = datetime.now(timezone.utc).isoformat()
+        if not get_repository().create_user(email, password_hash, now):
             return rx.toast.error("Email already registered.")
-        password_hash = self._hash_password(password)
-        new_user: User = {"email": email, "password_hash": password_hash}
-        updated_users = self.users + [new_user]
-        self._save_users(updated_users)
-        yield rx.toast.success("Registration successful! Please log in.")
-        return rx.redirect("/login")
+        return [
+            rx.toast.success("Registration successful! Please log in."),
+            rx.redirect("/login"),
+        ]
+
+    async def _flush_pending_writes(self):
+        """Write out the buffered item edits of whoever used this session last."""
+        from app.states.collections_state import CollectionsState
+
+        collections_state = await self.get_state(CollectionsState)
+        await collections_state._flush_pending_writes()
 
     @rx.event
-    def login(self, form_data: dict):
-        """Log in a user."""
+    async def login(self, form_data: dict):
+        """Log in a user, writing out the previous user's buffered edits first."""
         email = form_data.get("email", "").strip().lower()
         password = form_data.get("password", "")
         if not email or not password:
             return rx.toast.error("Email and password are required.")
-        user = next((u for u in self.users if u["email"] == email), None)
-        password_hash = self._hash_password(password)
-        if not user or user["password_hash"] != password_hash:
+        password_hash = get_repository().get_password_hash(email)
+        if password_hash is None or not await asyncio.to_thread(
+            verify_password, password, password_hash
+        ):
             return rx.toast.error("Invalid email or password.")
-        self.session_json = json.dumps({"email": user["email"]})
+        await self._flush_pending_writes()
+        end_session(get_repository(), self.session_token)
+        self.session_token = start_session(get_repository(), email)
         return rx.redirect("/")
 
     @rx.event
-    def logout(self):
-        """Log out the current user."""
-        self.session_json = ""
+    async def logout(self):
+        """Log out the current user, writing out their buffered edits first."""
+        await self._flush_pending_writes()
+        end_session(get_repository(), self.session_token)
+        self.session_token = ""
         return rx.redirect("/login")
 
     @rx.event
     def check_auth(self):
-        """Check if the user is authenticated and redirect if not."""
-        if not self.is_authenticated:
+        """Check if the user is authenticated and redirect if not.
+
+        The session is looked up again, since the cached user stays set
+        until the token changes, even after the session expires.
+        """
+        if not session_email(get_repository(), self.session_token):
+            self.session_token = ""
             return rx.redirect("/login")
\ No newline at end of file
@@ -0,0 +1,56 @@
+"""Warn when a state grows past its serialized size budget.
+
+With the disk or Redis state manager every event loads and saves the
+pickled state of each touched substate, so its size is paid on every
+event. Reflex's own check only covers states with substates; this one
+covers the leaf states of this app. The budget is set in KiB with
+``COLLECTIONS_STATE_BUDGET_KB`` (64 by default, 0 disables the check).
+"""
+
+import functools
+import logging
+import os
+import time
+
+import reflex as rx
+
+STATE_BUDGET_BYTES = int(os.environ.get("COLLECTIONS_STATE_BUDGET_KB", "64")) * 1024
+WARN_INTERVAL_SECONDS = 60.0
+
+# state name -> when it was last reported over budget
+_last_warned: dict[str, float] = {}
+
+
+def check_state_size(state_name: str, size: int):
+    """Log a warning, at most once a minute per state, if size is over budget."""
+    if not STATE_BUDGET_BYTES or size <= STATE_BUDGET_BYTES:
+        return
+    now = time.monotonic()
+    last = _last_warned.get(state_name)
+    if last is not None and now - last < WARN_INTERVAL_SECONDS:
+        return
+    _last_warned[state_name] = now
+    logging.warning(
+        f"State {state_name} serializes to {size} bytes, over its budget of "
+        f"{STATE_BUDGET_BYTES} bytes (COLLECTIONS_STATE_BUDGET_KB)."
+    )
+
+
+def install(*state_classes: type[rx.State]):
+    """Check the serialized size of the given states each time they are saved.
+
+    Reflex rejects states that define a method named like a builtin one, so
+    the check wraps ``_serialize`` after the classes are created.
+    """
+    if not STATE_BUDGET_BYTES:
+        return
+    for state_cls in state_classes:
+        serialize = state_cls._serialize
+
+        @functools.wraps(serialize)
+        def checked_serialize(self, serialize=serialize) -> bytes:
+            payload = serialize(self)
+            check_state_size(self.get_full_name(), len(payload))
+            return payload
+
+        state_cls._serialize = checked_serialize
@@ -1,30 +1,29 @@
 import reflex as rx
-from typing import TypedDict, Literal, Optional
-import uuid
+from typing import Optional
+import asyncio
 import json
-import logging
+import uuid
+from urllib.parse import urlencode
 from datetime import datetime, timezone
 
-Color = Literal["orange", "blue", "green", "purple", "pink", "gray"]
+from app.api import create_export_token
+from app.models import Color, Collection, Item, SearchHit, TagFacet, TrashEntry
+from app.states.auth_state import AuthState
+from app.storage.importer import ImportErrors, detect_format, iter_import_items
+from app.storage.migrate import import_user_local_storage
+from app.storage.repository import UserPartition, get_repository
+from app.storage.tags import normalize_tag, parse_tags
 
+COLLECTION_PAGE_SIZE = 48
+ITEM_PAGE_SIZE = 60
+TAG_FACET_LIMIT = 24
+TAG_SUGGESTION_LIMIT = 8
+WRITE_FLUSH_SECONDS = 2.0
 
-class Item(TypedDict):
-    id: str
-    name: str
-    description: str
-    tags: list[str]
-    collection_id: str
-    created_at: str
-    updated_at: str
 
-
-class Collection(TypedDict):
-    id: str
-    name: str
-    description: str
-    color: Color
-    item_count: int
-    updated_at: str
+def _last_page_offset(total: int, page_size: int) -> int:
+    """Return where the last page of ``total`` entries starts."""
+    return max(0, (total - 1) // page_size * page_size)
 
 
 class CollectionsState(rx.State):
@@ -32,6 +31,13 @@ class CollectionsState(rx.State):
 
     _collections_json: str = rx.LocalStorage("{}", name="collections")
     _items_json: str = rx.LocalStorage("{}", name="items")
+    _collections_version: int = 0
+    _items_version: int = 0
+    # Item edits not yet written to storage, by item id, the email of the
+    # user who made them, and whether a delayed flush is already on its way.
+    _pending_items: dict[str, Item] = {}
+    _pending_owner: str = ""
+    _flush_scheduled: bool = False
     search_query: str = ""
     is_new_collection_modal_open: bool = False
     is_edit_collection_modal_open: bool = False
@@ -39,6 +45,8 @@ class CollectionsState(rx.State):
     is_new_item_modal_open: bool = False
     is_edit_item_modal_open: bool = False
     is_delete_item_modal_open: bool = False
+    is_import_items_modal_open: bool = False
+    import_errors: list[str] = []
     editing_collection: Optional[Collection] = None
     deleting_collection_id: Optional[str] = None
     editing_item: Optional[Item] = None
@@ -48,115 +56,259 @@ class CollectionsState(rx.State):
     new_collection_color: Color = "orange"
     preset_colors: list[Color] = ["orange", "blue", "green", "purple", "pink", "gray"]
     item_search_query: str = ""
-
-    @rx.var
+    global_search_query: str = ""
+    # Where the visible page starts; pages have a fixed size.
+    collection_offset: int = 0
+    item_offset: int = 0
+    selected_item_ids: list[str] = []
+    trash_entries: list[TrashEntry] = []
+    bulk_tag: str = ""
+    # Normalized tags the visible items are filtered by, and whether an item
+    # needs all of them or any one.
+    selected_tags: list[str] = []
+    tag_match_all: bool = True
+    # The text of the tag input being typed into, for suggestions.
+    _tag_input: str = ""
+
+    @rx.var(deps=[AuthState.current_user_email], auto_deps=False)
     async def current_user_email(self) -> str:
-        """The email of the currently logged-in user."""
-        from app.states.auth_state import AuthState
+        """The email of the currently logged-in user, empty when logged out.
 
+        This is the only place AuthState is read. The value is cached with
+        this state and only recomputed when the session changes (login,
+        logout or hydrating the session from LocalStorage), so events on this
+        state never need to load AuthState to know who the user is.
+        """
         auth_state = await self.get_state(AuthState)
         return auth_state.current_user_email
 
-    @rx.var
-    def all_collections(self) -> dict[str, list[Collection]]:
-        """All collections for all users."""
-        try:
-            return json.loads(self._collections_json) if self._collections_json else {}
-        except json.JSONDecodeError as e:
-            logging.exception(f"Error decoding _collections_json: {e}")
-            return {}
-
-    @rx.var
-    async def collections(self) -> list[Collection]:
-        """The list of collections for the current user."""
-        from app.states.auth_state import AuthState
-
-        auth_state = await self.get_state(AuthState)
-        if not self.is_hydrated or not auth_state.is_authenticated:
-            return []
-        user_email = await self.get_value(auth_state.current_user_email)
-        return self.all_collections.get(user_email, [])
+    async def _partition(self, items: bool = False) -> Optional[UserPartition]:
+        """Helper to get the current user's storage partition, if logged in.
+
+        With ``items``, the partition's item index is built first, on a
+        worker thread, so the item reads that follow never build it on the
+        event loop.
+        """
+        user_email = await self.current_user_email
+        if not user_email:
+            return None
+        partition = get_repository().partition(user_email)
+        if items:
+            await partition.load_item_index()
+        return partition
+
+    def _mark_collections_changed(self):
+        """Helper to invalidate the vars derived from the user's collections."""
+        self._collections_version += 1
+
+    def _mark_items_changed(self):
+        """Helper to invalidate the vars derived from the user's items.
+
+        Item mutations only call this: the affected collection is patched
+        into current_collection, and the collection list is refreshed when
+        the dashboard is next loaded, so an item edit never resends it.
+        """
+        self._items_version += 1
+
+    async def _collections(self) -> list[Collection]:
+        """Helper to get the current user's collections.
+
+        This is read through the partition's version cache rather than kept
+        in a var, so the full list never becomes part of the saved state.
+        """
+        partition = await self._partition()
+        return partition.list_collections() if partition else []
 
-    async def _save_collections(self, collections: list[Collection]):
-        """Helper to save collections for the current user to local storage."""
-        from app.states.auth_state import AuthState
+    @rx.event
+    async def migrate_local_storage(self):
+        """Import the current user's data left in the legacy LocalStorage blobs.
 
-        auth_state = await self.get_state(AuthState)
-        if not auth_state.is_authenticated:
+        The blobs are cleared afterwards, other accounts' entries included,
+        so they do not ride along in every saved state of the session.
+        """
+        if self._collections_json in ("", "{}") and self._items_json in ("", "{}"):
             return
-        user_email = auth_state.current_user_email
-        all_collections = self.all_collections
-        all_collections[user_email] = collections
-        self._collections_json = json.dumps(all_collections)
-
-    @rx.var
-    def all_items(self) -> dict[str, list[Item]]:
-        """All items for all users."""
-        try:
-            return json.loads(self._items_json) if self._items_json else {}
-        except json.JSONDecodeError as e:
-            logging.exception(f"Error decoding _items_json: {e}")
-            return {}
-
-    @rx.var
-    async def items(self) -> list[Item]:
-        """The list of items for the current user."""
-        from app.states.auth_state import AuthState
+        partition = await self._partition()
+        if not partition:
+            return
+        imported = import_user_local_storage(
+            partition, self._collections_json, self._items_json
+        )
+        self._collections_json = "{}"
+        self._items_json = "{}"
+        if imported:
+            self._mark_collections_changed()
+            self._mark_items_changed()
 
-        auth_state = await self.get_state(AuthState)
-        if not self.is_hydrated or not auth_state.is_authenticated:
+    @rx.event
+    async def refresh_collections(self):
+        """Pick up collection changes made by item mutations elsewhere."""
+        await self._flush_pending_writes()
+        self._leave_collection_detail()
+        self._mark_collections_changed()
+
+    def _leave_collection_detail(self):
+        """Helper to drop the state of the collection page once it is left.
+
+        Otherwise the item vars would keep recomputing for a collection no
+        longer shown, reading (and after a collection delete, rebuilding)
+        the item index on every item or collection write.
+        """
+        self.current_collection = None
+        self._tag_input = ""
+
+    @rx.var(
+        deps=[
+            "_collections_version",
+            "current_user_email",
+            "search_query",
+            "collection_offset",
+        ],
+        auto_deps=False,
+        backend=True,
+    )
+    async def collection_window(self) -> list[Collection]:
+        """The visible page of collections plus one, to detect a next page."""
+        offset, limit = self.collection_offset, COLLECTION_PAGE_SIZE + 1
+        if not self.search_query.strip():
+            return (await self._collections())[offset : offset + limit]
+        partition = await self._partition()
+        if not partition:
             return []
-        user_email = await self.get_value(auth_state.current_user_email)
-        return self.all_items.get(user_email, [])
-
-    async def _save_items(self, items: list[Item]):
-        """Helper to save items for the current user to local storage."""
-        from app.states.auth_state import AuthState
-
-        auth_state = await self.get_state(AuthState)
-        if not auth_state.is_authenticated:
-            return
-        user_email = auth_state.current_user_email
-        all_items = self.all_items
-        all_items[user_email] = items
-        self._items_json = json.dumps(all_items)
+        return partition.search_collections(self.search_query, limit, offset)
 
-    @rx.var
+    @rx.var(deps=["collection_window"], auto_deps=False)
     async def filtered_collections(self) -> list[Collection]:
-        """A list of collections filtered by the search query."""
-        collections = await self.collections
-        if not self.search_query.strip():
-            return collections
-        query = self.search_query.lower()
+        """The visible page of collections filtered by the search query."""
+        return (await self.collection_window)[:COLLECTION_PAGE_SIZE]
+
+    @rx.var(deps=["collection_window"], auto_deps=False)
+    async def has_more_collections(self) -> bool:
+        """Whether there are collections after the visible page."""
+        return len(await self.collection_window) > COLLECTION_PAGE_SIZE
+
+    @rx.var(
+        deps=[
+            "_items_version",
+            "current_user_email",
+            "current_collection",
+            "item_search_query",
+            "item_offset",
+            "selected_tags",
+            "tag_match_all",
+        ],
+        auto_deps=False,
+        backend=True,
+    )
+    async def item_window(self) -> list[Item]:
+        """The visible page of items plus one, to detect a next page."""
+        if not self.current_collection:
+            return []
+        partition = await self._partition(items=True)
+        if not partition:
+            return []
+        collection_id = self.current_collection["id"]
+        offset, limit = self.item_offset, ITEM_PAGE_SIZE + 1
+        tags, match_all = self.selected_tags, self.tag_match_all
+        if not self.item_search_query.strip():
+            items = partition.list_items(
+                collection_id, limit, tags, match_all, offset
+            )
+        else:
+            items = partition.search_items(
+                self.item_search_query,
+                collection_id,
+                limit,
+                tags,
+                match_all,
+                offset,
+            )
+        if self._pending_items:
+            items = [self._pending_items.get(item["id"], item) for item in items]
+        return items
+
+    @rx.var(deps=["item_window"], auto_deps=False)
+    async def items_in_current_collection(self) -> list[Item]:
+        """The visible page of items in the currently viewed collection."""
+        return (await self.item_window)[:ITEM_PAGE_SIZE]
+
+    @rx.var(deps=["item_window"], auto_deps=False)
+    async def has_more_items(self) -> bool:
+        """Whether there are items after the visible page."""
+        return len(await self.item_window) > ITEM_PAGE_SIZE
+
+    @rx.var(
+        deps=["_items_version", "current_user_email", "current_collection"],
+        auto_deps=False,
+    )
+    async def tag_facets(self) -> list[TagFacet]:
+        """The most used tags in the current collection, with their item counts."""
+        if not self.current_collection:
+            return []
+        partition = await self._partition(items=True)
+        if not partition:
+            return []
+        return partition.tag_facets(self.current_collection["id"], TAG_FACET_LIMIT)
+
+    @rx.var(
+        deps=["_items_version", "current_user_email", "_tag_input"],
+        auto_deps=False,
+    )
+    async def tag_suggestions(self) -> list[str]:
+        """Completions of the tag input: its text with the last tag completed.
+
+        The input may hold a comma separated list, so each suggestion is the
+        whole new value, as a datalist option replaces what was typed.
+        """
+        head, comma, prefix = self._tag_input.rpartition(",")
+        if not prefix.strip():
+            return []
+        partition = await self._partition(items=True)
+        if not partition:
+            return []
+        typed = {normalize_tag(tag) for tag in parse_tags(head)}
+        head = f"{head}, " if comma else ""
         return [
-            c
-            for c in collections
-            if query in c["name"].lower() or query in c["description"].lower()
+            head + tag
+            for tag in partition.suggest_tags(prefix, TAG_SUGGESTION_LIMIT)
+            if tag not in typed
         ]
 
-    @rx.var
-    async def items_in_current_collection(self) -> list[Item]:
-        """Get items for the currently viewed collection."""
+    @rx.var(
+        deps=["_collections_version", "current_user_email", "current_collection"],
+        auto_deps=False,
+    )
+    async def move_target_collections(self) -> list[Collection]:
+        """The collections that selected items can be moved to."""
         if not self.current_collection:
             return []
-        collection_id = self.current_collection["id"]
-        items = await self.items
-        filtered_items = [i for i in items if i["collection_id"] == collection_id]
-        if not self.item_search_query.strip():
-            return filtered_items
-        query = self.item_search_query.lower()
         return [
-            i
-            for i in filtered_items
-            if query in i["name"].lower()
-            or query in i["description"].lower()
-            or any((query in tag.lower() for tag in i["tags"]))
+            c
+            for c in await self._collections()
+            if c["id"] != self.current_collection["id"]
         ]
 
-    @rx.var
+    @rx.var(
+        deps=[
+            "_collections_version",
+            "_items_version",
+            "current_user_email",
+            "global_search_query",
+        ],
+        auto_deps=False,
+    )
+    async def global_search_results(self) -> list[SearchHit]:
+        """The top items across all collections matching the global search."""
+        if not self.global_search_query.strip():
+            return []
+        partition = await self._partition(items=True)
+        return partition.search_all(self.global_search_query) if partition else []
+
+    @rx.var(deps=["_collections_version", "current_user_email"], auto_deps=False)
     async def collections_exist(self) -> bool:
-        collections = await self.collections
-        return len(collections) > 0
+        """Whether the current user has any collections, without listing them."""
+        partition = await self._partition()
+        return partition.count_collections() > 0 if partition else False
 
     def _reset_collection_form(self):
         """Helper to reset collection form fields."""
@@ -173,6 +325,17 @@ class CollectionsState(rx.State):
     def set_search_query(self, query: str):
         """Set the search query."""
         self.search_query = query
+        self.collection_offset = 0
+
+    @rx.event
+    def next_collections_page(self):
+        """Show the next page of collections."""
+        self.collection_offset += COLLECTION_PAGE_SIZE
+
+    @rx.event
+    def previous_collections_page(self):
+        """Show the previous page of collections."""
+        self.collection_offset = max(0, self.collection_offset - COLLECTION_PAGE_SIZE)
 
     @rx.event
     def toggle_new_collection_modal(self):
@@ -228,9 +391,11 @@ class CollectionsState(rx.State):
             "item_count": 0,
             "updated_at": now,
         }
-        current_collections = await self.collections
-        current_collections.insert(0, new_collection)
-        await self._save_collections(current_collections)
+        partition = await self._partition()
+        if not partition:
+            return rx.toast.error("You must be logged in to create a collection.")
+        partition.put_collection(new_collection)
+        self._mark_collections_changed()
         self.is_new_collection_modal_open = False
         self._reset_collection_form()
         return rx.toast.success(f"Collection '{new_collection['name']}' created!")
@@ -244,15 +409,19 @@ class CollectionsState(rx.State):
         if not name:
             return rx.toast.error("Collection name cannot be empty.")
         now = datetime.now(timezone.utc).isoformat()
-        updated_collections = await self.collections
-        for i, c in enumerate(updated_collections):
-            if c["id"] == self.editing_collection["id"]:
-                updated_collections[i]["name"] = name
-                updated_collections[i]["description"] = form_data.get("description", "")
-                updated_collections[i]["color"] = self.new_collection_color
-                updated_collections[i]["updated_at"] = now
-                break
-        await self._save_collections(updated_collections)
+        partition = await self._partition()
+        collection = (
+            partition.get_collection(self.editing_collection["id"])
+            if partition
+            else None
+        )
+        if collection:
+            collection["name"] = name
+            collection["description"] = form_data.get("description", "")
+            collection["color"] = self.new_collection_color
+            collection["updated_at"] = now
+            partition.put_collection(collection)
+            self._mark_collections_changed()
         self.close_edit_collection_modal()
         return rx.toast.success(f"Collection '{name}' updated!")
 
@@ -261,18 +430,20 @@ class CollectionsState(rx.State):
         """Delete the selected collection and all its items."""
         if not self.deleting_collection_id:
             return rx.toast.error("No collection selected for deletion.")
-        collections = await self.collections
-        updated_collections = [
-            c for c in collections if c["id"] != self.deleting_collection_id
-        ]
-        await self._save_collections(updated_collections)
-        items = await self.items
-        updated_items = [
-            i for i in items if i["collection_id"] != self.deleting_collection_id
-        ]
-        await self._save_items(updated_items)
+        await self._flush_pending_writes()
+        partition = await self._partition()
+        if partition:
+            now = datetime.now(timezone.utc).isoformat()
+            partition.delete_collection(self.deleting_collection_id, now)
+            self._mark_collections_changed()
+            self._mark_items_changed()
+            remaining = len(await self._collections())
+            if self.collection_offset >= remaining:
+                self.collection_offset = _last_page_offset(
+                    remaining, COLLECTION_PAGE_SIZE
+                )
         self.close_delete_collection_modal()
-        return rx.toast.success("Collection deleted.")
+        return rx.toast.success("Collection moved to the trash.")
 
     @rx.event
     def go_to_collection(self, collection_id: str):
@@ -289,24 +460,84 @@ class CollectionsState(rx.State):
     @rx.event
     async def on_detail_load(self):
         """Load the collection data when the detail page loads."""
-        from app.states.auth_state import AuthState
-
-        auth_state = await self.get_state(AuthState)
-        if not auth_state.is_authenticated:
+        await self._flush_pending_writes()
+        partition = await self._partition()
+        if not partition:
             return rx.redirect("/login")
         self.item_search_query = ""
-        collection_id = self.get_collection_id_from_route
-        collections = await self.collections
-        collection = next((c for c in collections if c["id"] == collection_id), None)
+        self.item_offset = 0
+        self.selected_tags = []
+        self.clear_item_selection()
+        collection = partition.get_collection(self.get_collection_id_from_route)
         if collection:
             self.current_collection = collection
         else:
             return rx.redirect("/")
 
     @rx.event
-    def set_item_search_query(self, query: str):
+    async def set_item_search_query(self, query: str):
         """Set the item search query for the current collection."""
+        # Buffered edits are overlaid on the visible page, which only holds
+        # while no filter or search picks that page, so write them first.
+        await self._flush_pending_writes()
         self.item_search_query = query
+        self.item_offset = 0
+
+    @rx.event
+    async def toggle_tag_filter(self, tag: str):
+        """Filter the visible items by a tag, or stop filtering by it."""
+        tag = normalize_tag(tag)
+        if not tag:
+            return
+        await self._flush_pending_writes()
+        if tag in self.selected_tags:
+            self.selected_tags.remove(tag)
+        else:
+            self.selected_tags.append(tag)
+        self.item_offset = 0
+
+    @rx.event
+    async def handle_tag_filter_submit(self, form_data: dict):
+        """Add the tag typed into the facet filter input."""
+        tag = normalize_tag(form_data.get("tag", ""))
+        self._tag_input = ""
+        if tag and tag not in self.selected_tags:
+            await self.toggle_tag_filter(tag)
+
+    @rx.event
+    async def toggle_tag_match_mode(self):
+        """Switch between items with all of the selected tags and with any."""
+        await self._flush_pending_writes()
+        self.tag_match_all = not self.tag_match_all
+        self.item_offset = 0
+
+    @rx.event
+    async def clear_tag_filters(self):
+        """Show the items regardless of their tags."""
+        await self._flush_pending_writes()
+        self.selected_tags = []
+        self.item_offset = 0
+
+    @rx.event
+    def set_tag_input(self, text: str):
+        """Suggest completions for the last tag of a tag input."""
+        self._tag_input = text
+
+    @rx.event
+    def next_items_page(self):
+        """Show the next page of items."""
+        self.item_offset += ITEM_PAGE_SIZE
+
+    @rx.event
+    def previous_items_page(self):
+        """Show the previous page of items."""
+        self.item_offset = max(0, self.item_offset - ITEM_PAGE_SIZE)
+
+    @rx.event
+    async def set_global_search_query(self, query: str):
+        """Set the search query for the all-items search page."""
+        await self._flush_pending_writes()
+        self.global_search_query = query
 
     @rx.event
     def toggle_new_item_modal(self):
@@ -341,21 +572,55 @@ class CollectionsState(rx.State):
         self.is_delete_item_modal_open = False
         self.deleting_item_id = None
 
-    async def _update_collection_meta(self, collection_id: str, item_delta: int):
-        """Update item count and last updated time for a collection."""
-        collections = await self.collections
+    async def _flush_pending_writes(self):
+        """Write every buffered item edit to storage in a single write.
+
+        Called before any other item write, so writes reach storage in the
+        order they were made, when navigating, on logout, and by the delayed
+        flush scheduled with the first buffered edit.
+
+        The edits go to the partition of the user who made them, even if the
+        session has since ended or changed hands, and stay buffered if the
+        write fails. Edits to items trashed meanwhile are dropped.
+        """
+        self._flush_scheduled = False
+        if not self._pending_items:
+            return
+        owner = self._pending_owner
+        partition = get_repository().partition(owner)
         now = datetime.now(timezone.utc).isoformat()
-        for i, c in enumerate(collections):
-            if c["id"] == collection_id:
-                collections[i]["item_count"] += item_delta
-                collections[i]["updated_at"] = now
-                if (
-                    self.current_collection
-                    and self.current_collection["id"] == collection_id
-                ):
-                    self.current_collection = collections[i]
-                break
-        await self._save_collections(collections)
+        collections = partition.update_items(list(self._pending_items.values()), now)
+        self._pending_items = {}
+        self._pending_owner = ""
+        if owner != await self.current_user_email:
+            return
+        for collection in collections:
+            self._apply_item_write(collection)
+
+    @rx.event(background=True)
+    async def flush_pending_writes_later(self):
+        """Flush buffered item edits once a burst of edits has settled."""
+        await asyncio.sleep(WRITE_FLUSH_SECONDS)
+        async with self:
+            await self._flush_pending_writes()
+
+    def _apply_item_write(self, collection: Optional[Collection]):
+        """Reflect an item write and its updated collection in the state.
+
+        The repository updates the item and its collection's item count in
+        one atomic write, and returns the collection to patch in here.
+        """
+        if (
+            collection
+            and self.current_collection
+            and self.current_collection["id"] == collection["id"]
+        ):
+            self.current_collection = collection
+            if self.item_offset >= collection["item_count"]:
+                self.item_offset = _last_page_offset(
+                    collection["item_count"], ITEM_PAGE_SIZE
+                )
+        self._mark_items_changed()
 
     @rx.event
     async def handle_create_item_submit(self, form_data: dict):
@@ -366,8 +631,7 @@ class CollectionsState(rx.State):
         if not name:
             return rx.toast.error("Item name cannot be empty.")
         now = datetime.now(timezone.utc).isoformat()
-        tags_str = form_data.get("tags", "")
-        tags = [tag.strip() for tag in tags_str.split(",") if tag.strip()]
+        tags = parse_tags(form_data.get("tags", ""))
         new_item: Item = {
             "id": str(uuid.uuid4()),
             "name": name,
@@ -377,10 +641,11 @@ class CollectionsState(rx.State):
             "created_at": now,
             "updated_at": now,
         }
-        current_items = await self.items
-        current_items.insert(0, new_item)
-        await self._save_items(current_items)
-        await self._update_collection_meta(new_item["collection_id"], 1)
+        await self._flush_pending_writes()
+        partition = await self._partition()
+        if not partition:
+            return rx.toast.error("You must be logged in to add an item.")
+        self._apply_item_write(partition.put_item(new_item))
         self.is_new_item_modal_open = False
         return rx.toast.success(f"Item '{name}' added.")
 
@@ -393,38 +658,259 @@ class CollectionsState(rx.State):
         if not name:
             return rx.toast.error("Item name cannot be empty.")
         now = datetime.now(timezone.utc).isoformat()
-        tags_str = form_data.get("tags", "")
-        tags = [tag.strip() for tag in tags_str.split(",") if tag.strip()]
-        updated_items = await self.items
-        for i, item in enumerate(updated_items):
-            if item["id"] == self.editing_item["id"]:
-                updated_items[i]["name"] = name
-                updated_items[i]["description"] = form_data.get("description", "")
-                updated_items[i]["tags"] = tags
-                updated_items[i]["updated_at"] = now
-                break
-        await self._save_items(updated_items)
-        await self._update_collection_meta(self.editing_item["collection_id"], 0)
+        tags = parse_tags(form_data.get("tags", ""))
+        item_id = self.editing_item["id"]
         self.close_edit_item_modal()
-        return rx.toast.success(f"Item '{name}' updated.")
+        user_email = await self.current_user_email
+        if not user_email:
+            return rx.toast.error("You must be logged in to edit an item.")
+        if self._pending_items and self._pending_owner != user_email:
+            await self._flush_pending_writes()
+        item = self._pending_items.get(item_id)
+        if item is None:
+            partition = get_repository().partition(user_email)
+            await partition.load_item_index()
+            item = partition.get_item(item_id)
+        if not item:
+            return rx.toast.error("Item not found.")
+        # Buffer the edit: a burst of edits is written once, when it settles.
+        self._pending_owner = user_email
+        self._pending_items[item_id] = {
+            **item,
+            "name": name,
+            "description": form_data.get("description", ""),
+            "tags": tags,
+            "updated_at": now,
+        }
+        self._mark_items_changed()
+        toast = rx.toast.success(f"Item '{name}' updated.")
+        if self.item_search_query.strip() or self.selected_tags:
+            # The edit may move the item in or out of the filtered page.
+            await self._flush_pending_writes()
+            return toast
+        if self._flush_scheduled:
+            return toast
+        self._flush_scheduled = True
+        return [toast, CollectionsState.flush_pending_writes_later]
 
     @rx.event
     async def delete_item(self):
         """Delete an item."""
         if not self.deleting_item_id:
             return rx.toast.error("No item to delete.")
-        items = await self.items
-        item_to_delete = next(
-            (i for i in items if i["id"] == self.deleting_item_id), None
+        await self._flush_pending_writes()
+        partition = await self._partition(items=True)
+        item_to_delete = (
+            partition.get_item(self.deleting_item_id) if partition else None
         )
         if not item_to_delete:
             self.close_delete_item_modal()
             return rx.toast.error("Item not found.")
-        updated_items = [i for i in items if i["id"] != self.deleting_item_id]
-        await self._save_items(updated_items)
-        await self._update_collection_meta(item_to_delete["collection_id"], -1)
+        now = datetime.now(timezone.utc).isoformat()
+        self._apply_item_write(partition.delete_item(self.deleting_item_id, now))
         self.close_delete_item_modal()
-        return rx.toast.success("Item deleted.")
+        return rx.toast.success("Item moved to the trash.")
+
+    @rx.event
+    def toggle_item_selection(self, item_id: str):
+        """Add an item to the bulk selection, or remove it if already selected."""
+        if item_id in self.selected_item_ids:
+            self.selected_item_ids.remove(item_id)
+        else:
+            self.selected_item_ids.append(item_id)
+
+    @rx.event
+    async def select_visible_items(self):
+        """Select every item on the visible page."""
+        window = await self.items_in_current_collection
+        self.selected_item_ids = [item["id"] for item in window]
+
+    @rx.event
+    def clear_item_selection(self):
+        """Clear the bulk selection."""
+        self.selected_item_ids = []
+        self.bulk_tag = ""
+
+    @rx.event
+    def set_bulk_tag(self, tag: str):
+        """Set the tag to add to or remove from the selected items."""
+        self.bulk_tag = tag
+        self._tag_input = tag
+
+    def _apply_item_writes(self, collections: list[Collection]):
+        """Reflect a bulk item write and its affected collections in the state."""
+        for collection in collections:
+            self._apply_item_write(collection)
+        self.clear_item_selection()
+
+    async def _selected_items(self) -> tuple[Optional[UserPartition], list[Item]]:
+        """Helper to load the selected items that still exist."""
+        await self._flush_pending_writes()
+        partition = await self._partition(items=True)
+        if not partition:
+            return None, []
+        items = (partition.get_item(item_id) for item_id in self.selected_item_ids)
+        return partition, [item for item in items if item]
+
+    @rx.event
+    async def bulk_delete_items(self):
+        """Delete every selected item in a single write."""
+        partition, items = await self._selected_items()
+        if not items:
+            return rx.toast.error("No items selected.")
+        now = datetime.now(timezone.utc).isoformat()
+        item_ids = [item["id"] for item in items]
+        self._apply_item_writes(partition.delete_items(item_ids, now))
+        return rx.toast.success(f"Moved {len(items)} items to the trash.")
+
+    @rx.event
+    async def bulk_move_items(self, collection_id: str):
+        """Move every selected item to another collection in a single write."""
+        partition, items = await self._selected_items()
+        if not items:
+            return rx.toast.error("No items selected.")
+        target = partition.get_collection(collection_id)
+        if not target:
+            return rx.toast.error("Collection not found.")
+        now = datetime.now(timezone.utc).isoformat()
+        for item in items:
+            item["collection_id"] = collection_id
+            item["updated_at"] = now
+        self._apply_item_writes(partition.put_items(items, now))
+        return rx.toast.success(f"Moved {len(items)} items to '{target['name']}'.")
+
+    async def _bulk_tag_items(self, add: bool):
+        """Helper to add or remove the bulk tags on every selected item.
+
+        The bulk tag field is comma separated like the item form, so several
+        tags can be added or removed at once.
+        """
+        tags = {normalize_tag(tag): tag for tag in parse_tags(self.bulk_tag)}
+        if not tags:
+            return rx.toast.error("Tag cannot be empty.")
+        partition, items = await self._selected_items()
+        if not items:
+            return rx.toast.error("No items selected.")
+        now = datetime.now(timezone.utc).isoformat()
+        changed = []
+        for item in items:
+            if add:
+                present = {normalize_tag(t) for t in item["tags"]}
+                missing = [tag for key, tag in tags.items() if key not in present]
+                if not missing:
+                    continue
+                item["tags"].extend(missing)
+            else:
+                kept = [t for t in item["tags"] if normalize_tag(t) not in tags]
+                if len(kept) == len(item["tags"]):
+                    continue
+                item["tags"] = kept
+            item["updated_at"] = now
+            changed.append(item)
+        self._apply_item_writes(partition.put_items(changed, now))
+        verb = "Tagged" if add else "Untagged"
+        return rx.toast.success(f"{verb} {len(changed)} items.")
+
+    @rx.event
+    async def bulk_add_tag(self):
+        """Add the bulk tag to every selected item in a single write."""
+        return await self._bulk_tag_items(add=True)
+
+    @rx.event
+    async def bulk_remove_tag(self):
+        """Remove the bulk tag from every selected item in a single write."""
+        return await self._bulk_tag_items(add=False)
+
+    @rx.event
+    async def load_trash(self):
+        """Load the user's trashed collections and items."""
+        await self._flush_pending_writes()
+        self._leave_collection_detail()
+        partition = await self._partition()
+        self.trash_entries = partition.list_trash() if partition else []
+
+    @rx.event
+    async def restore_from_trash(self, entry: TrashEntry):
+        """Restore a trashed collection or item."""
+        await self._flush_pending_writes()
+        partition = await self._partition()
+        if not partition:
+            return rx.toast.error("You must be logged in to restore items.")
+        if entry["kind"] == "collection":
+            restored = partition.restore_collection(entry["id"])
+            self._mark_collections_changed()
+        else:
+            now = datetime.now(timezone.utc).isoformat()
+            restored = partition.restore_item(entry["id"], now) is not None
+        self._mark_items_changed()
+        self.trash_entries = partition.list_trash()
+        if not restored:
+            return rx.toast.error(f"'{entry['name']}' can no longer be restored.")
+        return rx.toast.success(f"'{entry['name']}' restored.")
+
+    @rx.event
+    def toggle_import_items_modal(self):
+        """Toggle the bulk item import modal."""
+        self.is_import_items_modal_open = not self.is_import_items_modal_open
+        self.import_errors = []
+
+    @rx.event
+    async def handle_import_items(self, files: list[rx.UploadFile]):
+        """Bulk import items into the current collection from CSV or JSON.
+
+        Each file is parsed as a stream and committed in one write with a
+        single item count update, both on a worker thread so a large file
+        does not hold up the event loop. Reflex does not run upload handlers
+        as background events, so this one still holds the state meanwhile.
+        """
+        if not self.current_collection:
+            return rx.toast.error("Cannot import items: no collection context.")
+        if not files:
+            return rx.toast.error("Choose a CSV or JSON file to import.")
+        await self._flush_pending_writes()
+        partition = await self._partition()
+        if not partition:
+            return rx.toast.error("You must be logged in to import items.")
+        collection_id = self.current_collection["id"]
+        errors = ImportErrors()
+        added = 0
+        for file in files:
+            file_format = detect_format(file.name or "")
+            if not file_format:
+                errors.add(f"{file.name}: unsupported file type.")
+                continue
+            now = datetime.now(timezone.utc).isoformat()
+            added += await partition.import_items(
+                collection_id,
+                iter_import_items(file.file, file_format, collection_id, errors),
+                now,
+            )
+        if added:
+            self._apply_item_write(partition.get_collection(collection_id))
+        self.import_errors = errors.messages
+        if errors.count:
+            return rx.toast.warning(
+                f"Imported {added} items, skipped {errors.count} invalid rows."
+            )
+        self.is_import_items_modal_open = False
+        return rx.toast.success(f"Imported {added} items.")
+
+    @rx.event
+    async def export_data(self, file_format: str):
+        """Download all of the user's data from the streaming export endpoint."""
+        await self._flush_pending_writes()
+        partition = await self._partition()
+        if not partition:
+            return rx.toast.error("You must be logged in to export data.")
+        query = urlencode(
+            {
+                "token": create_export_token(partition.user_email),
+                "format": file_format,
+                "gzip": 1,
+            }
+        )
+        url = f"{rx.config.get_config().api_url}/export?{query}"
+        return rx.call_script(f"window.location.assign({json.dumps(url)})")
 
     @rx.event
     def handle_key_down(self, event):
@@ -438,6 +924,10 @@ class CollectionsState(rx.State):
             meta_key = False
             ctrl_key = False
         if (meta_key or ctrl_key) and key == "k":
+            if self.router.page.path.startswith("/search"):
+                return rx.call_script(
+                    "document.getElementById('global_search_input').focus(); event.preventDefault();"
+                )
             if self.router.page.path.startswith("/collections/"):
                 return rx.call_script(
                     "document.getElementById('item_search_input').focus(); event.preventDefault();"
@@ -447,7 +937,8 @@ class CollectionsState(rx.State):
                     "document.getElementById('collection_search_input').focus(); event.preventDefault();"
                 )
         if not (meta_key or ctrl_key) and key == "n":
-            if not self.router.page.path.startswith("/collections/"):
+            # Only the dashboard renders the New Collection modal.
+            if not self.router.page.path.startswith(("/collections/", "/search")):
                 self.is_new_collection_modal_open = True
                 return rx.call_script("event.preventDefault();")
         if key == "escape":
@@ -462,4 +953,6 @@ class CollectionsState(rx.State):
             if self.is_edit_item_modal_open:
                 yield CollectionsState.close_edit_item_modal
             if self.is_delete_item_modal_open:
-                yield CollectionsState.close_delete_item_modal
\ No newline at end of file
+                yield CollectionsState.close_delete_item_modal
+            if self.is_import_items_modal_open:
+                yield CollectionsState.toggle_import_items_modal
\ No newline at end of file
@@ -0,0 +1,70 @@
+"""Accounts and login sessions, kept in the repository.
+
+Passwords are stored as salted PBKDF2 hashes, and sessions under the SHA-256
+of a random token, so neither a password nor a usable session token can be
+read back from the database. The browser only holds the token; the email a
+session acts for is always the one the repository has on record for it.
+"""
+
+from typing import Optional
+import hashlib
+import hmac
+import os
+import secrets
+from datetime import datetime, timedelta, timezone
+
+from app.storage.repository import Repository
+
+PASSWORD_ITERATIONS = 200_000
+SESSION_TTL_DAYS = float(os.environ.get("COLLECTIONS_SESSION_TTL_DAYS", "30"))
+
+
+def hash_password(password: str) -> str:
+    """Return a salted hash of a password, slow enough to resist guessing."""
+    salt = secrets.token_bytes(16)
+    digest = hashlib.pbkdf2_hmac(
+        "sha256", password.encode(), salt, PASSWORD_ITERATIONS
+    )
+    return f"pbkdf2_sha256${PASSWORD_ITERATIONS}${salt.hex()}${digest.hex()}"
+
+
+def verify_password(password: str, password_hash: str) -> bool:
+    """Check a password against a hash made by ``hash_password``."""
+    try:
+        algorithm, iterations, salt, digest = password_hash.split("$")
+        expected = hashlib.pbkdf2_hmac(
+            "sha256", password.encode(), bytes.fromhex(salt), int(iterations)
+        )
+    except ValueError:
+        return False
+    return algorithm == "pbkdf2_sha256" and hmac.compare_digest(
+        expected.hex(), digest
+    )
+
+
+def _token_hash(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def start_session(repository: Repository, user_email: str) -> str:
+    """Open a session for a verified user and return its token."""
+    now = datetime.now(timezone.utc)
+    repository.delete_expired_sessions(now.isoformat())
+    token = secrets.token_urlsafe(32)
+    expires_at = now + timedelta(days=SESSION_TTL_DAYS)
+    repository.create_session(_token_hash(token), user_email, expires_at.isoformat())
+    return token
+
+
+def session_email(repository: Repository, token: str) -> Optional[str]:
+    """Return the email of the user a session token belongs to, if still valid."""
+    if not token:
+        return None
+    now = datetime.now(timezone.utc).isoformat()
+    return repository.get_session_email(_token_hash(token), now)
+
+
+def end_session(repository: Repository, token: str):
+    """Invalidate a session token."""
+    if token:
+        repository.delete_session(_token_hash(token))
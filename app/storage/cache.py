@@ -0,0 +1,105 @@
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, TypeVar
+import os
+import threading
+
+T = TypeVar("T")
+
+INDEX_CACHE_MAX_ITEMS = int(os.environ.get("COLLECTIONS_INDEX_CACHE_ITEMS", "250000"))
+
+
+class VersionedCache:
+    """An LRU of decoded values, each tagged with the version it was loaded at.
+
+    A lookup is a hit only while the caller's version still matches, so a
+    value is decoded once per write to its source instead of once per read.
+    Cached values are shared between callers and must not be mutated.
+
+    With ``weigh``, the cache is also bounded by the summed weight of its
+    values, so a few large values cannot hold an unbounded amount of memory.
+    The most recently stored value is always kept, whatever it weighs.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        max_weight: Optional[int] = None,
+        weigh: Optional[Callable[[Any], int]] = None,
+    ):
+        self.max_entries = max_entries
+        self.max_weight = max_weight
+        self.weigh = weigh
+        self.weight = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[Hashable, Any, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, version: Hashable, loader: Callable[[], T]) -> T:
+        """Return the value cached for key at version, loading it on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        value = loader()
+        self.put(key, version, value)
+        return value
+
+    def peek(self, key: Hashable, version: Hashable) -> Any:
+        """Return the value cached for key at version without loading or counting."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[1] if entry is not None and entry[0] == version else None
+
+    def put(self, key: Hashable, version: Hashable, value: Any):
+        """Store a value that was brought up to date by the caller."""
+        weight = self.weigh(value) if self.weigh else 0
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.weight -= previous[2]
+            self._entries[key] = (version, value, weight)
+            self.weight += weight
+            while len(self._entries) > 1 and (
+                len(self._entries) > self.max_entries
+                or (self.max_weight is not None and self.weight > self.max_weight)
+            ):
+                self.weight -= self._entries.popitem(last=False)[1][2]
+
+    def invalidate(self, key: Hashable):
+        """Drop a single entry."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.weight -= entry[2]
+
+    def clear(self):
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.weight = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, float]:
+        """Return hit/miss counters and the hit rate."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "weight": self.weight,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+partition_cache = VersionedCache()
+# Per-user item indexes, weighed by how many items they hold. They are kept
+# apart from the small decoded lists so neither evicts the other.
+index_cache = VersionedCache(
+    max_entries=64, max_weight=INDEX_CACHE_MAX_ITEMS, weigh=len
+)
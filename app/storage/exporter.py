@@ -0,0 +1,105 @@
+"""Streaming serializers for exporting a user's data.
+
+Records are read from storage in batches and encoded one line at a time, so
+an export never holds the whole account or a single large JSON string in
+memory. Output is yielded as byte chunks suitable for a streaming response.
+"""
+
+from typing import Iterable, Iterator
+import csv
+import io
+import zlib
+
+from app.storage.codec import get_codec
+from app.storage.repository import Repository
+
+EXPORT_FORMATS = {"jsonl": "application/x-ndjson", "csv": "text/csv"}
+CSV_COLUMNS = [
+    "id",
+    "name",
+    "description",
+    "tags",
+    "collection_id",
+    "collection_name",
+    "created_at",
+    "updated_at",
+]
+CHUNK_SIZE = 64 * 1024
+
+
+def _iter_jsonl(repo: Repository, user_email: str) -> Iterator[str]:
+    codec = get_codec()
+    for collection in repo.list_collections(user_email):
+        yield codec.dumps({"type": "collection", **collection}) + "\n"
+    for item in repo.iter_items(user_email):
+        yield codec.dumps({"type": "item", **item}) + "\n"
+
+
+def _iter_csv(repo: Repository, user_email: str) -> Iterator[str]:
+    names = {c["id"]: c["name"] for c in repo.list_collections(user_email)}
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_COLUMNS)
+    for item in repo.iter_items(user_email):
+        writer.writerow(
+            [
+                item["id"],
+                item["name"],
+                item["description"],
+                ", ".join(item["tags"]),
+                item["collection_id"],
+                names.get(item["collection_id"], ""),
+                item["created_at"],
+                item["updated_at"],
+            ]
+        )
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def _chunked(lines: Iterable[str]) -> Iterator[bytes]:
+    pending: list[bytes] = []
+    size = 0
+    for line in lines:
+        data = line.encode("utf-8")
+        pending.append(data)
+        size += len(data)
+        if size >= CHUNK_SIZE:
+            yield b"".join(pending)
+            pending, size = [], 0
+    if pending:
+        yield b"".join(pending)
+
+
+def _gzipped(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(wbits=31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def iter_export(
+    repo: Repository, user_email: str, file_format: str, compress: bool = False
+) -> Iterator[bytes]:
+    """Yield the user's data as JSON Lines or CSV byte chunks.
+
+    JSON Lines output contains every collection followed by every item, each
+    tagged with a ``type`` field. CSV output contains one row per item with
+    its collection name. With ``compress`` the stream is gzip encoded.
+    """
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {file_format}")
+    lines = (
+        _iter_csv(repo, user_email)
+        if file_format == "csv"
+        else _iter_jsonl(repo, user_email)
+    )
+    chunks = _chunked(lines)
+    return _gzipped(chunks) if compress else chunks
+
+
+def export_filename(file_format: str, compress: bool = False) -> str:
+    return f"collections.{file_format}" + (".gz" if compress else "")
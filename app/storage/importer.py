@@ -0,0 +1,196 @@
+"""Streaming parsers for bulk item import.
+
+Files are decoded and parsed one row at a time, so an import never holds the
+raw file or a parsed copy of it in memory; rows flow straight into a single
+repository write.
+"""
+
+from typing import BinaryIO, Iterator, Optional
+import csv
+import io
+import json
+import re
+import uuid
+from datetime import datetime, timezone
+
+from app.models import Item
+from app.storage.codec import get_codec
+from app.storage.tags import parse_tags
+
+MAX_REPORTED_ERRORS = 20
+JSON_READ_SIZE = 64 * 1024
+# An array element still incomplete after this many characters is treated as
+# invalid rather than read on to the end of the file.
+MAX_JSON_ELEMENT_SIZE = 1024 * 1024
+_WHITESPACE = re.compile(r"\s*")
+
+
+class ImportErrors:
+    """Collects row validation errors while an import stream is consumed."""
+
+    def __init__(self):
+        self.count = 0
+        self.messages: list[str] = []
+
+    def add(self, message: str, line: Optional[int] = None):
+        self.count += 1
+        if len(self.messages) < MAX_REPORTED_ERRORS:
+            self.messages.append(f"Line {line}: {message}" if line else message)
+
+
+def detect_format(filename: str) -> Optional[str]:
+    """Return "csv", "jsonl" or "json" based on the file extension, or None."""
+    name = filename.lower()
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    if name.endswith(".json"):
+        return "json"
+    return None
+
+
+def _iter_csv(text: io.TextIOBase) -> Iterator[tuple[int, dict]]:
+    reader = csv.DictReader(text)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def _iter_jsonl(
+    text: io.TextIOBase, errors: ImportErrors
+) -> Iterator[tuple[int, dict]]:
+    for line_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = get_codec().loads(line)
+        except json.JSONDecodeError as e:
+            errors.add(f"invalid JSON ({e.msg})", line_number)
+            continue
+        if not isinstance(row, dict):
+            errors.add("expected a JSON object", line_number)
+            continue
+        yield line_number, row
+
+
+def _iter_json_array(
+    text: io.TextIOBase, errors: ImportErrors
+) -> Iterator[tuple[int, dict]]:
+    """Yield the elements of a top-level JSON array one at a time.
+
+    The text is read in chunks and each element is decoded as soon as it is
+    complete, so the array is never parsed as a whole. Unlike JSON Lines, a
+    syntax error leaves no way to find the next element, so it ends the file.
+    """
+    decoder = json.JSONDecoder()
+    buffer, pos, eof = "", 0, False
+    # Lines before ``line_pos`` in the buffer, counted incrementally.
+    line, line_pos = 1, 0
+
+    def skip_whitespace() -> str:
+        """Advance past whitespace and return the next character, if any."""
+        nonlocal buffer, pos, eof, line, line_pos
+        while True:
+            pos = _WHITESPACE.match(buffer, pos).end()
+            if pos < len(buffer) or eof:
+                return buffer[pos : pos + 1]
+            line += buffer.count("\n", line_pos)
+            chunk = text.read(JSON_READ_SIZE)
+            eof = not chunk
+            buffer, pos, line_pos = chunk, 0, 0
+
+    def line_at_pos() -> int:
+        nonlocal line, line_pos
+        line += buffer.count("\n", line_pos, pos)
+        line_pos = pos
+        return line
+
+    if skip_whitespace() != "[":
+        errors.add("expected a JSON array of item objects", line_at_pos())
+        return
+    pos += 1
+    if skip_whitespace() == "]":
+        pos += 1
+    else:
+        while True:
+            try:
+                row, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as e:
+                row, end = None, None
+                error = e
+            # A value decoded up to the end of the buffer may continue in the
+            # next chunk, so it is decoded again once more text is read. Reads
+            # double in size, so a large element is decoded only a few times.
+            pending = len(buffer) - pos
+            if (
+                (end is None and pending < MAX_JSON_ELEMENT_SIZE)
+                or end == len(buffer)
+            ) and not eof:
+                line += buffer.count("\n", line_pos, pos)
+                chunk = text.read(max(JSON_READ_SIZE, pending))
+                eof = not chunk
+                buffer, pos, line_pos = buffer[pos:] + chunk, 0, 0
+                continue
+            if end is None:
+                errors.add(f"invalid JSON ({error.msg})", line_at_pos())
+                return
+            line_number = line_at_pos()
+            pos = end
+            if isinstance(row, dict):
+                yield line_number, row
+            else:
+                errors.add("expected a JSON object", line_number)
+            separator = skip_whitespace()
+            pos += 1
+            if separator == "]":
+                break
+            if separator != ",":
+                errors.add("expected ',' or ']' in the array", line_at_pos())
+                return
+            skip_whitespace()
+    if skip_whitespace():
+        errors.add("unexpected data after the array", line_at_pos())
+
+
+def _parse_tags(value) -> list[str]:
+    if isinstance(value, list):
+        value = ",".join(str(tag) for tag in value)
+    return parse_tags(str(value or ""))
+
+
+def iter_import_items(
+    stream: BinaryIO, file_format: str, collection_id: str, errors: ImportErrors
+) -> Iterator[Item]:
+    """Parse a CSV, JSON Lines or JSON array stream into new items for a collection.
+
+    Rows need a non-empty ``name``; ``description`` and ``tags`` (a list, or
+    a comma-separated string as in the item form) are optional. Invalid rows
+    are skipped and recorded in ``errors``. All items share one timestamp.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if file_format == "csv":
+        rows = _iter_csv(text)
+    elif file_format == "json":
+        rows = _iter_json_array(text, errors)
+    else:
+        rows = _iter_jsonl(text, errors)
+    now = datetime.now(timezone.utc).isoformat()
+    try:
+        for line_number, row in rows:
+            name = str(row.get("name") or "").strip()
+            if not name:
+                errors.add("missing name", line_number)
+                continue
+            yield {
+                "id": str(uuid.uuid4()),
+                "name": name,
+                "description": str(row.get("description") or ""),
+                "tags": _parse_tags(row.get("tags")),
+                "collection_id": collection_id,
+                "created_at": now,
+                "updated_at": now,
+            }
+    except (UnicodeDecodeError, csv.Error) as e:
+        errors.add(f"could not read file ({e})")
+    finally:
+        text.detach()
@@ -0,0 +1,158 @@
+from itertools import islice
+from typing import Iterable, Optional
+
+from app.models import Item
+from app.storage.records import ItemRecord
+from app.storage.search import SearchIndex
+from app.storage.tags import TagRegistry
+
+ITEM_FIELD_WEIGHTS = {"name": 3.0, "tags": 2.0, "description": 1.0}
+
+
+def _search_fields(record: ItemRecord) -> dict:
+    return {
+        "name": record.name,
+        "description": record.description,
+        "tags": list(record.tags),
+    }
+
+
+class ItemIndex:
+    """In-memory lookup tables over one user's items.
+
+    ``by_id`` maps item id to item, and ``by_collection`` maps a collection id
+    to its item ids in insertion order (a dict used as an ordered set), so
+    adds and removes are O(1) and listing a collection only walks its own ids.
+    ``search`` is a full-text index over the same items and ``tags`` a
+    registry of their normalized tags, both kept in step.
+
+    Items are added as ``Item`` dicts but held and returned as compact
+    ``ItemRecord`` objects, which callers convert with ``to_item``.
+    """
+
+    def __init__(self, items: Iterable[Item] = ()):
+        self.by_id: dict[str, ItemRecord] = {}
+        self.by_collection: dict[str, dict[str, None]] = {}
+        self.search = SearchIndex(ITEM_FIELD_WEIGHTS)
+        self.tags = TagRegistry()
+        for item in reversed(list(items)):
+            self.add(item)
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def get(self, item_id: str) -> Optional[ItemRecord]:
+        """Return the item with the given id, if any."""
+        return self.by_id.get(item_id)
+
+    def count_in(self, collection_id: str) -> int:
+        """Return how many items a collection has."""
+        return len(self.by_collection.get(collection_id, {}))
+
+    def items_in(
+        self,
+        collection_id: str,
+        limit: Optional[int] = None,
+        tags: Optional[list[str]] = None,
+        match_all: bool = True,
+        offset: int = 0,
+    ) -> list[ItemRecord]:
+        """Return a collection's items, newest first, up to limit if given.
+
+        With ``tags``, only items carrying all of them (or any, if not
+        ``match_all``) are returned. The first ``offset`` items are skipped.
+        """
+        stop = None if limit is None else offset + limit
+        if tags:
+            tagged = self._tagged(collection_id, tags, match_all)
+            ids = self.search.newest(tagged, stop)[offset:]
+        else:
+            ids = islice(
+                reversed(self.by_collection.get(collection_id, {})), offset, stop
+            )
+        return [self.by_id[item_id] for item_id in ids]
+
+    def all_items(self) -> list[ItemRecord]:
+        """Return every item, newest first."""
+        return list(reversed(self.by_id.values()))
+
+    def search_items(
+        self,
+        query: str,
+        collection_id: Optional[str] = None,
+        limit: Optional[int] = None,
+        max_candidates: Optional[int] = None,
+        tags: Optional[list[str]] = None,
+        match_all: bool = True,
+        offset: int = 0,
+    ) -> list[ItemRecord]:
+        """Return items matching a search query, best match first.
+
+        ``tags``, ``match_all`` and ``offset`` work as in ``items_in``.
+        """
+        within = None
+        if tags:
+            within = self._tagged(collection_id, tags, match_all)
+        elif collection_id is not None:
+            within = self.by_collection.get(collection_id, {})
+        hits = self.search.search(
+            query,
+            within=within,
+            limit=None if limit is None else offset + limit,
+            max_candidates=max_candidates,
+        )
+        return [self.by_id[item_id] for item_id, _ in hits[offset:]]
+
+    def _tagged(
+        self, collection_id: Optional[str], tags: list[str], match_all: bool
+    ) -> set[str]:
+        within = None
+        if collection_id is not None:
+            within = self.by_collection.get(collection_id, {})
+        return self.tags.match(tags, match_all, within)
+
+    def add(self, item: Item):
+        """Add a new item as the newest of its collection."""
+        record = ItemRecord.from_item(item)
+        self.by_id[record.id] = record
+        self.by_collection.setdefault(record.collection_id, {})[record.id] = None
+        self.search.add(record.id, _search_fields(record))
+        self.tags.add(record.id, record.collection_id, record.tags)
+
+    def update(self, item: Item):
+        """Replace an item in place, moving it if its collection changed."""
+        previous = self.by_id.get(item["id"])
+        if previous is None:
+            self.add(item)
+            return
+        record = ItemRecord.from_item(item)
+        if previous.collection_id != record.collection_id:
+            self.by_collection[previous.collection_id].pop(record.id, None)
+            self.by_collection.setdefault(record.collection_id, {})[record.id] = None
+            # A moved item is the newest item, in its new collection and in
+            # search order, as the repository lists it.
+            del self.by_id[record.id]
+            self.search.remove(record.id)
+        self.by_id[record.id] = record
+        self.search.add(record.id, _search_fields(record))
+        self.tags.remove(previous.id, previous.collection_id, previous.tags)
+        self.tags.add(record.id, record.collection_id, record.tags)
+
+    def remove(self, item_id: str) -> Optional[ItemRecord]:
+        """Remove an item and return it."""
+        record = self.by_id.pop(item_id, None)
+        if record is not None:
+            self.by_collection.get(record.collection_id, {}).pop(item_id, None)
+            self.search.remove(item_id)
+            self.tags.remove(item_id, record.collection_id, record.tags)
+        return record
+
+    def remove_collection(self, collection_id: str) -> list[str]:
+        """Remove every item of a collection and return their ids."""
+        ids = list(self.by_collection.pop(collection_id, {}))
+        for item_id in ids:
+            record = self.by_id.pop(item_id, None)
+            self.search.remove(item_id)
+            if record is not None:
+                self.tags.remove(item_id, collection_id, record.tags)
+        return ids
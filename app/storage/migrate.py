@@ -0,0 +1,90 @@
+"""One-shot import of the legacy LocalStorage blobs into the repository.
+
+The blobs are the JSON dicts previously stored under the ``collections`` and
+``items`` LocalStorage keys, mapping each user's email to their records. The
+import is idempotent: records that already exist are left untouched.
+
+Usage: python -m app.storage.migrate collections.json items.json
+"""
+
+from typing import Callable, TypeVar
+import json
+import logging
+import sys
+
+from app.storage.codec import get_codec, to_collection, to_item
+from app.storage.repository import Repository, UserPartition, get_repository
+
+T = TypeVar("T")
+
+
+def _decode_blob(blob: str, name: str) -> dict[str, list]:
+    if not blob:
+        return {}
+    try:
+        data = get_codec().loads(blob)
+    except json.JSONDecodeError as e:
+        logging.exception(f"Error decoding legacy {name} blob: {e}")
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _records(records: list, convert: Callable[[dict], T]) -> list[T]:
+    """Decode one user's legacy records, skipping any that are malformed."""
+    decoded = []
+    for record in records if isinstance(records, list) else []:
+        try:
+            decoded.append(convert(record))
+        except (TypeError, ValueError) as e:
+            logging.warning(f"Skipping malformed legacy record: {e}")
+    return decoded
+
+
+def import_local_storage(
+    repository: Repository, collections_json: str, items_json: str
+) -> int:
+    """Import legacy collections/items blobs and return the number of new records."""
+    all_collections = _decode_blob(collections_json, "collections")
+    all_items = _decode_blob(items_json, "items")
+    imported = 0
+    for user_email in set(all_collections) | set(all_items):
+        imported += repository.import_records(
+            user_email,
+            _records(all_collections.get(user_email, []), to_collection),
+            _records(all_items.get(user_email, []), to_item),
+        )
+    return imported
+
+
+def import_user_local_storage(
+    partition: UserPartition, collections_json: str, items_json: str
+) -> int:
+    """Import only the partition owner's records from the legacy blobs.
+
+    Entries of other emails are ignored: the blobs come from the browser, so
+    nothing vouches that they belong to the accounts they name. Returns the
+    number of new records.
+    """
+    all_collections = _decode_blob(collections_json, "collections")
+    all_items = _decode_blob(items_json, "items")
+    return partition.import_records(
+        _records(all_collections.get(partition.user_email, []), to_collection),
+        _records(all_items.get(partition.user_email, []), to_item),
+    )
+
+
+def main(argv: list[str]) -> int:
+    if len(argv) != 2:
+        print(__doc__.strip().splitlines()[-1], file=sys.stderr)
+        return 2
+    with open(argv[0]) as f:
+        collections_json = f.read()
+    with open(argv[1]) as f:
+        items_json = f.read()
+    imported = import_local_storage(get_repository(), collections_json, items_json)
+    print(f"Imported {imported} records.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,133 @@
+"""Compact in-memory item records.
+
+The item index keeps every item of a user in memory, so items are held as
+``ItemRecord`` objects rather than ``Item`` dicts: slotted attributes instead
+of a per-record key table, tags as a tuple of interned strings, the
+collection id interned, and timestamps as integer epoch microseconds. Records
+are turned back into ``Item`` dicts with ``to_item`` only when they leave the
+storage layer, which is a page or a search result at a time.
+"""
+
+from typing import Optional, Union
+import functools
+import re
+import sys
+from datetime import date
+
+from app.models import Item
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+DAY_MICROS = 86_400_000_000
+# The UTC format written by datetime.isoformat(), which omits a zero
+# fraction; anything else is kept as text so it converts back verbatim.
+_ISO_UTC = re.compile(
+    r"\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d(?:\.(?!000000)\d{6})?\+00:00"
+)
+
+# An int for timestamps in the app's own format, the original text otherwise.
+Timestamp = Union[int, str]
+
+
+# Timestamps are converted by hand with the date part cached, which is
+# several times faster than a datetime round trip per value.
+@functools.lru_cache(maxsize=4096)
+def _day_micros(day: str) -> int:
+    return (date.fromisoformat(day).toordinal() - EPOCH_ORDINAL) * DAY_MICROS
+
+
+@functools.lru_cache(maxsize=4096)
+def _day_text(days: int) -> str:
+    return date.fromordinal(days + EPOCH_ORDINAL).isoformat()
+
+
+def to_micros(timestamp) -> Optional[int]:
+    """Return a UTC ISO timestamp as epoch microseconds, if that is lossless."""
+    if not isinstance(timestamp, str) or not _ISO_UTC.fullmatch(timestamp):
+        return None
+    seconds = (
+        int(timestamp[11:13]) * 3600
+        + int(timestamp[14:16]) * 60
+        + int(timestamp[17:19])
+    )
+    micros = _day_micros(timestamp[:10]) + seconds * 1_000_000
+    return micros + int(timestamp[20:26]) if len(timestamp) == 32 else micros
+
+
+def from_micros(micros: int) -> str:
+    """Format epoch microseconds the way ``datetime.isoformat()`` does in UTC."""
+    days, micros = divmod(micros, DAY_MICROS)
+    seconds, fraction = divmod(micros, 1_000_000)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    time = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+    if fraction:
+        return f"{_day_text(days)}T{time}.{fraction:06d}+00:00"
+    return f"{_day_text(days)}T{time}+00:00"
+
+
+def pack_timestamp(timestamp: str) -> Timestamp:
+    micros = to_micros(timestamp)
+    return timestamp if micros is None else micros
+
+
+def unpack_timestamp(timestamp: Timestamp) -> str:
+    return timestamp if isinstance(timestamp, str) else from_micros(timestamp)
+
+
+class ItemRecord:
+    """An item as held in memory; see the module docstring."""
+
+    __slots__ = (
+        "id",
+        "name",
+        "description",
+        "tags",
+        "collection_id",
+        "created_at",
+        "updated_at",
+    )
+
+    def __init__(
+        self,
+        id: str,
+        name: str,
+        description: str,
+        tags: tuple[str, ...],
+        collection_id: str,
+        created_at: Timestamp,
+        updated_at: Timestamp,
+    ):
+        self.id = id
+        self.name = name
+        self.description = description
+        self.tags = tags
+        self.collection_id = collection_id
+        self.created_at = created_at
+        self.updated_at = updated_at
+
+    @classmethod
+    def from_item(cls, item: Item) -> "ItemRecord":
+        return cls(
+            item["id"],
+            item["name"],
+            item["description"],
+            tuple(sys.intern(tag) for tag in item["tags"]),
+            sys.intern(item["collection_id"]),
+            pack_timestamp(item["created_at"]),
+            pack_timestamp(item["updated_at"]),
+        )
+
+    def to_item(self) -> Item:
+        """Return the record as a new ``Item`` dict the caller may modify."""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "description": self.description,
+            "tags": list(self.tags),
+            "collection_id": self.collection_id,
+            "created_at": unpack_timestamp(self.created_at),
+            "updated_at": unpack_timestamp(self.updated_at),
+        }
+
+    def __repr__(self) -> str:
+        return f"ItemRecord({self.to_item()!r})"
@@ -0,0 +1,599 @@
+from abc import ABC, abstractmethod
+from typing import Callable, Iterable, Iterator, Optional, TypeVar
+import asyncio
+import os
+
+from app.models import Collection, Item, SearchHit, TagFacet, TrashEntry
+from app.storage.cache import index_cache, partition_cache
+from app.storage.index import ItemIndex
+from app.storage.search import SearchIndex
+
+COLLECTION_FIELD_WEIGHTS = {"name": 3.0, "description": 1.0}
+GLOBAL_SEARCH_LIMIT = 50
+GLOBAL_SEARCH_MAX_CANDIDATES = 5_000
+
+T = TypeVar("T")
+
+
+class Repository(ABC):
+    """Interface for persisting collections and items, one record at a time.
+
+    Every method is scoped by the owning user's email so backends never have
+    to load another account's data to serve a request.
+    """
+
+    @abstractmethod
+    def list_collections(self, user_email: str) -> list[Collection]:
+        """Return the user's collections, newest first."""
+
+    @abstractmethod
+    def count_collections(self, user_email: str) -> int:
+        """Return how many collections the user has, without loading them."""
+
+    @abstractmethod
+    def get_collection(
+        self, user_email: str, collection_id: str
+    ) -> Optional[Collection]:
+        """Return a single collection, or None if it does not exist."""
+
+    @abstractmethod
+    def put_collection(self, user_email: str, collection: Collection) -> None:
+        """Insert or update a collection."""
+
+    @abstractmethod
+    def delete_collection(
+        self, user_email: str, collection_id: str, deleted_at: str
+    ) -> None:
+        """Move a collection to the trash, hiding it and every item it contains.
+
+        This is a single cheap write regardless of the collection's size; the
+        rows are removed later by ``purge_deleted``.
+        """
+
+    @abstractmethod
+    def restore_collection(self, user_email: str, collection_id: str) -> bool:
+        """Bring a trashed collection back with its items, if it still exists."""
+
+    @abstractmethod
+    def list_deleted_collections(
+        self, user_email: str
+    ) -> list[tuple[Collection, str]]:
+        """Return the user's trashed collections with their deleted_at, newest first."""
+
+    @abstractmethod
+    def list_deleted_items(self, user_email: str) -> list[tuple[Item, str]]:
+        """Return the user's trashed items with their deleted_at, newest first.
+
+        Items inside a trashed collection are not listed; they come back
+        with their collection.
+        """
+
+    @abstractmethod
+    def purge_deleted(self, deleted_before: str, batch_size: int = 1000) -> int:
+        """Permanently remove records trashed before a timestamp, in batches.
+
+        Returns how many collections and items were purged. Meant to run off
+        the request path, without holding up other writes for long.
+        """
+
+    @abstractmethod
+    def list_items(
+        self, user_email: str, collection_id: Optional[str] = None
+    ) -> list[Item]:
+        """Return the user's items, optionally limited to one collection."""
+
+    @abstractmethod
+    def iter_items(self, user_email: str, batch_size: int = 1000) -> Iterator[Item]:
+        """Yield the user's items newest first, fetching them in batches."""
+
+    @abstractmethod
+    def get_item(self, user_email: str, item_id: str) -> Optional[Item]:
+        """Return a single item, or None if it does not exist."""
+
+    @abstractmethod
+    def put_item(self, user_email: str, item: Item) -> Optional[Collection]:
+        """Insert or update an item and return its updated collection.
+
+        The collection's item_count and updated_at are adjusted in the same
+        atomic write, including the old collection if the item moved.
+        """
+
+    @abstractmethod
+    def add_items(
+        self,
+        user_email: str,
+        collection_id: str,
+        items: Iterable[Item],
+        updated_at: str,
+    ) -> int:
+        """Insert many new items into one collection and return how many.
+
+        ``items`` is consumed lazily, and everything happens in a single
+        write with one item_count update.
+        """
+
+    @abstractmethod
+    def put_items(
+        self, user_email: str, items: list[Item], updated_at: str
+    ) -> list[Collection]:
+        """Insert or update many items and return every affected collection.
+
+        Runs as a single write with one count adjustment per collection that
+        gained or lost items, and touches the collections items stayed in.
+        """
+
+    @abstractmethod
+    def update_items(
+        self, user_email: str, items: list[Item], updated_at: str
+    ) -> list[Collection]:
+        """Write edits to many items that are still live and return their collections.
+
+        Items that were trashed or purged meanwhile are left alone rather than
+        brought back, and no item changes collection, so no count changes.
+        """
+
+    @abstractmethod
+    def delete_item(
+        self, user_email: str, item_id: str, updated_at: str
+    ) -> Optional[Collection]:
+        """Move an item to the trash and return its collection with the count adjusted."""
+
+    @abstractmethod
+    def delete_items(
+        self, user_email: str, item_ids: list[str], updated_at: str
+    ) -> list[Collection]:
+        """Move many items to the trash in one write and return the affected collections."""
+
+    @abstractmethod
+    def restore_item(
+        self, user_email: str, item_id: str, updated_at: str
+    ) -> Optional[Collection]:
+        """Bring a trashed item back and return its collection with the count adjusted."""
+
+    @abstractmethod
+    def reconcile_item_counts(self) -> int:
+        """Recount every collection's items, fix drifted counts and return how many."""
+
+    @abstractmethod
+    def partition_version(self, user_email: str) -> int:
+        """Return a counter that increases on every write to the user's data."""
+
+    @abstractmethod
+    def import_records(
+        self, user_email: str, collections: list[Collection], items: list[Item]
+    ) -> int:
+        """Insert records that do not exist yet and return how many were added.
+
+        Lists are given newest first, matching the order of the legacy blobs.
+        Item counts of the user's collections are recomputed afterwards.
+        """
+
+    @abstractmethod
+    def create_user(self, user_email: str, password_hash: str, created_at: str) -> bool:
+        """Add an account, returning False if the email is already registered."""
+
+    @abstractmethod
+    def get_password_hash(self, user_email: str) -> Optional[str]:
+        """Return the stored password hash of an account, if it exists."""
+
+    @abstractmethod
+    def create_session(self, token_hash: str, user_email: str, expires_at: str) -> None:
+        """Record a login session under the hash of its token."""
+
+    @abstractmethod
+    def get_session_email(self, token_hash: str, now: str) -> Optional[str]:
+        """Return the email of an unexpired session, if there is one."""
+
+    @abstractmethod
+    def delete_session(self, token_hash: str) -> None:
+        """End a login session."""
+
+    @abstractmethod
+    def delete_expired_sessions(self, now: str) -> int:
+        """Remove sessions that have expired and return how many."""
+
+    def partition(self, user_email: str) -> "UserPartition":
+        """Return a view of the repository bound to a single user's data."""
+        return UserPartition(self, user_email)
+
+
+class UserPartition:
+    """A user's slice of a repository.
+
+    State code holds one of these instead of passing the email to every call,
+    so nothing outside the active user's partition is ever read or written.
+    List reads are memoized in ``partition_cache`` against the partition
+    version, so they hit the backend once per write rather than once per read.
+
+    Item reads are served from an ``ItemIndex`` that is built once per
+    partition and then patched by each write made through this class. If the
+    version moved by more than our own write (another worker wrote in the
+    meantime) the index is dropped and rebuilt on the next read. Indexes are
+    held in ``index_cache``, bounded by the items they hold. The index holds
+    compact records; item reads return them as new ``Item`` dicts, so
+    callers may modify what they get without touching the cache.
+    """
+
+    def __init__(self, repository: Repository, user_email: str):
+        self.repository = repository
+        self.user_email = user_email
+
+    @property
+    def version(self) -> int:
+        return self.repository.partition_version(self.user_email)
+
+    @property
+    def _index_key(self) -> tuple:
+        return (self.user_email, "item_index")
+
+    def item_index(self) -> ItemIndex:
+        """Return the up to date item index, building it if needed."""
+        return index_cache.get(
+            self._index_key,
+            self.version,
+            lambda: ItemIndex(self.repository.list_items(self.user_email)),
+        )
+
+    async def load_item_index(self):
+        """Build the item index on a worker thread unless it is up to date.
+
+        A build reads and indexes every item of the user, which takes seconds
+        for a large partition, so async callers run this before item reads
+        to keep the build off the event loop.
+        """
+        if index_cache.peek(self._index_key, self.version) is None:
+            await asyncio.to_thread(self.item_index)
+
+    def _write(
+        self,
+        write: Callable[[], T],
+        patch: Optional[Callable[[ItemIndex], object]] = None,
+    ) -> T:
+        """Run a single backend write and patch the cached item index to match."""
+        before = self.version
+        index = index_cache.peek(self._index_key, before)
+        result = write()
+        self._patch_index(before, index, patch)
+        return result
+
+    async def _write_off_loop(
+        self,
+        write: Callable[[], T],
+        patch: Optional[Callable[[ItemIndex], object]] = None,
+    ) -> T:
+        """Like ``_write``, but run the backend write on a worker thread.
+
+        The cached index is still patched on the event loop, where it is
+        read, so no reader sees it half-patched.
+        """
+        before = self.version
+        index = index_cache.peek(self._index_key, before)
+        result = await asyncio.to_thread(write)
+        self._patch_index(before, index, patch)
+        return result
+
+    def _patch_index(
+        self,
+        before: int,
+        index: Optional[ItemIndex],
+        patch: Optional[Callable[[ItemIndex], object]],
+    ):
+        after = self.version
+        if after == before:
+            return
+        if index is None or after != before + 1:
+            index_cache.invalidate(self._index_key)
+        else:
+            if patch:
+                patch(index)
+            index_cache.put(self._index_key, after, index)
+
+    def list_collections(self) -> list[Collection]:
+        return partition_cache.get(
+            (self.user_email, "collections"),
+            self.version,
+            lambda: self.repository.list_collections(self.user_email),
+        )
+
+    def count_collections(self) -> int:
+        collections = partition_cache.peek(
+            (self.user_email, "collections"), self.version
+        )
+        if collections is not None:
+            return len(collections)
+        return self.repository.count_collections(self.user_email)
+
+    def get_collection(self, collection_id: str) -> Optional[Collection]:
+        return self.repository.get_collection(self.user_email, collection_id)
+
+    def _collection_search(self) -> tuple[SearchIndex, dict[str, Collection]]:
+        def build():
+            index = SearchIndex(COLLECTION_FIELD_WEIGHTS)
+            by_id = {}
+            for c in reversed(self.list_collections()):
+                index.add(c["id"], {"name": c["name"], "description": c["description"]})
+                by_id[c["id"]] = c
+            return index, by_id
+
+        return partition_cache.get(
+            (self.user_email, "collection_search"), self.version, build
+        )
+
+    def search_collections(
+        self, query: str, limit: Optional[int] = None, offset: int = 0
+    ) -> list[Collection]:
+        """Return collections matching a search query, best match first."""
+        index, by_id = self._collection_search()
+        hits = index.search(query, limit=None if limit is None else offset + limit)
+        return [by_id[collection_id] for collection_id, _ in hits[offset:]]
+
+    def put_collection(self, collection: Collection) -> None:
+        self._write(lambda: self.repository.put_collection(self.user_email, collection))
+
+    def delete_collection(self, collection_id: str, deleted_at: str) -> None:
+        # Unindexing a collection that holds most of the items costs more than
+        # rebuilding the index from what remains, so drop the index instead.
+        index = index_cache.peek(self._index_key, self.version)
+        if index is not None and 2 * index.count_in(collection_id) > len(index):
+            index_cache.invalidate(self._index_key)
+        self._write(
+            lambda: self.repository.delete_collection(
+                self.user_email, collection_id, deleted_at
+            ),
+            lambda index: index.remove_collection(collection_id),
+        )
+
+    def restore_collection(self, collection_id: str) -> bool:
+        def patch(index: ItemIndex):
+            items = self.repository.list_items(self.user_email, collection_id)
+            for item in reversed(items):
+                index.add(item)
+
+        return self._write(
+            lambda: self.repository.restore_collection(self.user_email, collection_id),
+            patch,
+        )
+
+    def list_trash(self) -> list[TrashEntry]:
+        """Return trashed collections and items, most recently deleted first."""
+        entries: list[TrashEntry] = [
+            {
+                "id": c["id"],
+                "kind": "collection",
+                "name": c["name"],
+                "detail": f"Collection with {c['item_count']} items",
+                "deleted_at": deleted_at,
+            }
+            for c, deleted_at in self.repository.list_deleted_collections(
+                self.user_email
+            )
+        ]
+        collections = {c["id"]: c for c in self.list_collections()}
+        for item, deleted_at in self.repository.list_deleted_items(self.user_email):
+            collection = collections.get(item["collection_id"])
+            entries.append(
+                {
+                    "id": item["id"],
+                    "kind": "item",
+                    "name": item["name"],
+                    "detail": f"Item in {collection['name']}" if collection else "Item",
+                    "deleted_at": deleted_at,
+                }
+            )
+        entries.sort(key=lambda entry: entry["deleted_at"], reverse=True)
+        return entries
+
+    def list_items(
+        self,
+        collection_id: Optional[str] = None,
+        limit: Optional[int] = None,
+        tags: Optional[list[str]] = None,
+        match_all: bool = True,
+        offset: int = 0,
+    ) -> list[Item]:
+        """Return items newest first, skipping the first ``offset``.
+
+        Within a collection, ``tags`` keeps only the items carrying all of
+        them, or any of them if not ``match_all``.
+        """
+        index = self.item_index()
+        if collection_id is None:
+            stop = None if limit is None else offset + limit
+            records = index.all_items()[offset:stop]
+        else:
+            records = index.items_in(collection_id, limit, tags, match_all, offset)
+        return [record.to_item() for record in records]
+
+    def search_items(
+        self,
+        query: str,
+        collection_id: Optional[str] = None,
+        limit: Optional[int] = None,
+        tags: Optional[list[str]] = None,
+        match_all: bool = True,
+        offset: int = 0,
+    ) -> list[Item]:
+        """Return items matching a search query, best match first."""
+        records = self.item_index().search_items(
+            query,
+            collection_id,
+            limit,
+            tags=tags,
+            match_all=match_all,
+            offset=offset,
+        )
+        return [record.to_item() for record in records]
+
+    def tag_facets(
+        self, collection_id: Optional[str] = None, limit: Optional[int] = None
+    ) -> list[TagFacet]:
+        """Return normalized tags with their item counts, most used first."""
+        return [
+            {"tag": tag, "count": count}
+            for tag, count in self.item_index().tags.facets(collection_id, limit)
+        ]
+
+    def suggest_tags(self, prefix: str, limit: int = 8) -> list[str]:
+        """Return the user's most used tags starting with a prefix."""
+        return self.item_index().tags.suggest(prefix, limit)
+
+    def search_all(
+        self, query: str, limit: int = GLOBAL_SEARCH_LIMIT
+    ) -> list[SearchHit]:
+        """Return the top hits for a query across every collection.
+
+        The candidate set is capped, so the cost is bounded no matter how
+        many items the user has.
+        """
+        collections = {c["id"]: c for c in self.list_collections()}
+        hits: list[SearchHit] = []
+        for record in self.item_index().search_items(
+            query, limit=limit, max_candidates=GLOBAL_SEARCH_MAX_CANDIDATES
+        ):
+            collection = collections.get(record.collection_id)
+            if collection is None:
+                continue
+            hits.append(
+                {
+                    "id": record.id,
+                    "name": record.name,
+                    "description": record.description,
+                    "tags": list(record.tags),
+                    "collection_id": record.collection_id,
+                    "collection_name": collection["name"],
+                    "collection_color": collection["color"],
+                }
+            )
+        return hits
+
+    def get_item(self, item_id: str) -> Optional[Item]:
+        record = self.item_index().get(item_id)
+        return record.to_item() if record else None
+
+    def put_item(self, item: Item) -> Optional[Collection]:
+        return self._write(
+            lambda: self.repository.put_item(self.user_email, item),
+            lambda index: index.update(item),
+        )
+
+    def _add_items_write(
+        self, collection_id: str, items: Iterable[Item], updated_at: str
+    ) -> tuple[Callable[[], int], Callable[[ItemIndex], object]]:
+        added: list[Item] = []
+
+        def record(items: Iterable[Item]) -> Iterator[Item]:
+            for item in items:
+                added.append(item)
+                yield item
+
+        def patch(index: ItemIndex):
+            for item in added:
+                index.add(item)
+
+        def write() -> int:
+            return self.repository.add_items(
+                self.user_email, collection_id, record(items), updated_at
+            )
+
+        return write, patch
+
+    def add_items(
+        self, collection_id: str, items: Iterable[Item], updated_at: str
+    ) -> int:
+        return self._write(*self._add_items_write(collection_id, items, updated_at))
+
+    async def import_items(
+        self, collection_id: str, items: Iterable[Item], updated_at: str
+    ) -> int:
+        """``add_items`` for large batches: ``items`` is consumed and written
+        on a worker thread, keeping the event loop free meanwhile."""
+        return await self._write_off_loop(
+            *self._add_items_write(collection_id, items, updated_at)
+        )
+
+    def put_items(self, items: list[Item], updated_at: str) -> list[Collection]:
+        def patch(index: ItemIndex):
+            for item in items:
+                index.update(item)
+
+        return self._write(
+            lambda: self.repository.put_items(self.user_email, items, updated_at),
+            patch,
+        )
+
+    def update_items(self, items: list[Item], updated_at: str) -> list[Collection]:
+        def patch(index: ItemIndex):
+            # The index holds exactly the live items, the ones written.
+            for item in items:
+                if index.get(item["id"]) is not None:
+                    index.update(item)
+
+        return self._write(
+            lambda: self.repository.update_items(self.user_email, items, updated_at),
+            patch,
+        )
+
+    def delete_item(self, item_id: str, updated_at: str) -> Optional[Collection]:
+        return self._write(
+            lambda: self.repository.delete_item(self.user_email, item_id, updated_at),
+            lambda index: index.remove(item_id),
+        )
+
+    def delete_items(self, item_ids: list[str], updated_at: str) -> list[Collection]:
+        def patch(index: ItemIndex):
+            for item_id in item_ids:
+                index.remove(item_id)
+
+        return self._write(
+            lambda: self.repository.delete_items(self.user_email, item_ids, updated_at),
+            patch,
+        )
+
+    def restore_item(self, item_id: str, updated_at: str) -> Optional[Collection]:
+        def patch(index: ItemIndex):
+            item = self.repository.get_item(self.user_email, item_id)
+            if item:
+                index.update(item)
+
+        return self._write(
+            lambda: self.repository.restore_item(self.user_email, item_id, updated_at),
+            patch,
+        )
+
+    def import_records(self, collections: list[Collection], items: list[Item]) -> int:
+        return self.repository.import_records(self.user_email, collections, items)
+
+
+_backends: dict[str, Callable[[], Repository]] = {}
+_repository: Optional[Repository] = None
+
+
+def register_backend(name: str, factory: Callable[[], Repository]):
+    """Register a storage backend selectable through COLLECTIONS_STORAGE_BACKEND."""
+    _backends[name] = factory
+
+
+def get_repository() -> Repository:
+    """Get the process-wide repository, creating it on first use."""
+    global _repository
+    if _repository is None:
+        name = os.environ.get("COLLECTIONS_STORAGE_BACKEND", "sqlite")
+        if name not in _backends:
+            raise ValueError(f"Unknown storage backend: {name}")
+        _repository = _backends[name]()
+    return _repository
+
+
+def set_repository(repository: Optional[Repository]):
+    """Replace the process-wide repository, e.g. with a custom backend."""
+    global _repository
+    _repository = repository
+
+
+def _sqlite_backend() -> Repository:
+    from app.storage.sqlite import SQLiteRepository
+
+    return SQLiteRepository(os.environ.get("COLLECTIONS_DB_PATH", "collections.db"))
+
+
+register_backend("sqlite", _sqlite_backend)
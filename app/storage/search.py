@@ -0,0 +1,208 @@
+from bisect import bisect_left, insort
+import heapq
+from collections.abc import Collection
+from typing import Optional, Union
+import re
+
+_WORD = re.compile(r"\w+")
+
+EXACT_MATCH = 1.0
+PREFIX_MATCH = 0.75
+INFIX_MATCH = 0.5
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase word tokens."""
+    return _WORD.findall(text.lower())
+
+
+def _trigrams(token: str) -> set[str]:
+    return {token[i : i + 3] for i in range(len(token) - 2)}
+
+
+class SearchIndex:
+    """An incrementally maintained inverted index over text fields.
+
+    Postings map each token to the documents containing it, weighted by the
+    most important field it appears in. Query terms match tokens exactly, by
+    prefix (a range scan over the sorted vocabulary) or, for terms of three or
+    more characters, anywhere inside a token (via trigram -> token postings).
+    A document must match every query term; results are ranked by summed
+    term scores, newest document first on ties.
+    """
+
+    def __init__(self, field_weights: dict[str, float]):
+        self.field_weights = field_weights
+        self._doc_tokens: dict[str, dict[str, float]] = {}
+        self._postings: dict[str, dict[str, float]] = {}
+        self._vocabulary: list[str] = []
+        self._trigrams: dict[str, set[str]] = {}
+        self._seq: dict[str, int] = {}
+        self._next_seq = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_tokens)
+
+    def add(self, doc_id: str, fields: dict[str, Union[str, list[str]]]):
+        """Index a document, replacing any previous version of it."""
+        if doc_id in self._doc_tokens:
+            self._unindex(doc_id)
+        else:
+            self._seq[doc_id] = self._next_seq
+            self._next_seq += 1
+        tokens: dict[str, float] = {}
+        for field, value in fields.items():
+            weight = self.field_weights.get(field, 1.0)
+            for text in value if isinstance(value, list) else [value]:
+                for token in tokenize(text):
+                    if weight > tokens.get(token, 0.0):
+                        tokens[token] = weight
+        self._doc_tokens[doc_id] = tokens
+        for token, weight in tokens.items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                insort(self._vocabulary, token)
+                for gram in _trigrams(token):
+                    self._trigrams.setdefault(gram, set()).add(token)
+            postings[doc_id] = weight
+
+    def remove(self, doc_id: str):
+        """Remove a document from the index."""
+        self._unindex(doc_id)
+        self._seq.pop(doc_id, None)
+
+    def _unindex(self, doc_id: str):
+        for token in self._doc_tokens.pop(doc_id, {}):
+            postings = self._postings[token]
+            del postings[doc_id]
+            if postings:
+                continue
+            del self._postings[token]
+            del self._vocabulary[bisect_left(self._vocabulary, token)]
+            for gram in _trigrams(token):
+                tokens = self._trigrams[gram]
+                tokens.discard(token)
+                if not tokens:
+                    del self._trigrams[gram]
+
+    def _expand(self, term: str) -> dict[str, float]:
+        """Map the vocabulary tokens matched by a query term to a match quality."""
+        matches: dict[str, float] = {}
+        vocabulary = self._vocabulary
+        i = bisect_left(vocabulary, term)
+        while i < len(vocabulary) and vocabulary[i].startswith(term):
+            matches[vocabulary[i]] = (
+                EXACT_MATCH if vocabulary[i] == term else PREFIX_MATCH
+            )
+            i += 1
+        if len(term) >= 3:
+            gram_sets = sorted(
+                (self._trigrams.get(gram, set()) for gram in _trigrams(term)), key=len
+            )
+            for token in gram_sets[0].intersection(*gram_sets[1:]):
+                if token not in matches and term in token:
+                    matches[token] = INFIX_MATCH
+        return matches
+
+    def _term_score(self, doc_id: str, matches: dict[str, float]) -> float:
+        """Score one document against the tokens matched by a query term."""
+        best = 0.0
+        doc_tokens = self._doc_tokens[doc_id]
+        if len(matches) < len(doc_tokens):
+            for token, quality in matches.items():
+                weight = doc_tokens.get(token)
+                if weight is not None and weight * quality > best:
+                    best = weight * quality
+        else:
+            for token, weight in doc_tokens.items():
+                quality = matches.get(token)
+                if quality is not None and weight * quality > best:
+                    best = weight * quality
+        return best
+
+    def search(
+        self,
+        query: str,
+        within: Optional[Collection[str]] = None,
+        limit: Optional[int] = None,
+        max_candidates: Optional[int] = None,
+    ) -> list[tuple[str, float]]:
+        """Return (doc_id, score) pairs matching every term of the query, best first.
+
+        If ``within`` is given, only those document ids are considered. Terms
+        are applied most selective first, and each step walks whichever is
+        smaller: the term's postings or the documents still in the running.
+
+        ``max_candidates`` bounds the work regardless of index size: the most
+        selective term contributes at most that many documents, taken from
+        its best-quality tokens and newest documents first.
+        """
+        terms = []
+        for term in dict.fromkeys(tokenize(query)):
+            matches = self._expand(term)
+            if not matches:
+                return []
+            size = sum(len(self._postings[token]) for token in matches)
+            terms.append((size, matches))
+        if not terms:
+            return []
+        terms.sort(key=lambda t: t[0])
+        candidates = within
+        scores: dict[str, float] = {}
+        for size, matches in terms:
+            if candidates is not None and len(candidates) < size:
+                term_scores = {}
+                for doc_id in candidates:
+                    if doc_id in self._doc_tokens:
+                        score = self._term_score(doc_id, matches)
+                        if score:
+                            term_scores[doc_id] = score
+            elif candidates is None and max_candidates is not None:
+                term_scores = self._bounded_postings(matches, max_candidates)
+            else:
+                term_scores = {}
+                for token, quality in matches.items():
+                    for doc_id, weight in self._postings[token].items():
+                        if candidates is not None and doc_id not in candidates:
+                            continue
+                        score = weight * quality
+                        if score > term_scores.get(doc_id, 0.0):
+                            term_scores[doc_id] = score
+            scores = {
+                doc_id: scores.get(doc_id, 0.0) + score
+                for doc_id, score in term_scores.items()
+            }
+            if not scores:
+                return []
+            candidates = scores
+        def rank(e):
+            return (-e[1], -self._seq[e[0]])
+
+        if limit is not None:
+            return heapq.nsmallest(limit, scores.items(), key=rank)
+        return sorted(scores.items(), key=rank)
+
+    def newest(
+        self, doc_ids: Collection[str], limit: Optional[int] = None
+    ) -> list[str]:
+        """Return the given indexed documents newest first, up to limit if given."""
+        seq = self._seq.__getitem__
+        if limit is not None:
+            return heapq.nlargest(limit, doc_ids, key=seq)
+        return sorted(doc_ids, key=seq, reverse=True)
+
+    def _bounded_postings(
+        self, matches: dict[str, float], max_candidates: int
+    ) -> dict[str, float]:
+        """Collect up to max_candidates documents for a term, best tokens first."""
+        term_scores: dict[str, float] = {}
+        for token, quality in sorted(matches.items(), key=lambda m: -m[1]):
+            postings = self._postings[token]
+            for doc_id in reversed(postings):
+                score = postings[doc_id] * quality
+                if score > term_scores.get(doc_id, 0.0):
+                    term_scores[doc_id] = score
+                    if len(term_scores) >= max_candidates:
+                        return term_scores
+        return term_scores
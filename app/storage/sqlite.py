@@ -0,0 +1,709 @@
+from typing import Iterable, Iterator, Optional
+import sqlite3
+import threading
+
+from app.models import Collection, Item
+from app.storage.codec import get_codec
+from app.storage.repository import Repository
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS collections (
+    user_email TEXT NOT NULL,
+    id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    description TEXT NOT NULL DEFAULT '',
+    color TEXT NOT NULL,
+    item_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT NOT NULL,
+    deleted_at TEXT,
+    PRIMARY KEY (user_email, id)
+);
+CREATE TABLE IF NOT EXISTS items (
+    user_email TEXT NOT NULL,
+    id TEXT NOT NULL,
+    collection_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    description TEXT NOT NULL DEFAULT '',
+    tags TEXT NOT NULL DEFAULT '[]',
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    deleted_at TEXT,
+    PRIMARY KEY (user_email, id)
+);
+CREATE INDEX IF NOT EXISTS items_by_collection ON items (user_email, collection_id);
+CREATE TABLE IF NOT EXISTS partitions (
+    user_email TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS users (
+    email TEXT PRIMARY KEY,
+    password_hash TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    token_hash TEXT PRIMARY KEY,
+    user_email TEXT NOT NULL,
+    expires_at TEXT NOT NULL
+);
+"""
+
+# Columns added after the first release, created on databases that predate them.
+_ADDED_COLUMNS = [
+    ("collections", "deleted_at", "TEXT"),
+    ("items", "deleted_at", "TEXT"),
+]
+
+_INDEXES = """
+CREATE INDEX IF NOT EXISTS collections_deleted ON collections (deleted_at)
+    WHERE deleted_at IS NOT NULL;
+CREATE INDEX IF NOT EXISTS items_deleted ON items (deleted_at)
+    WHERE deleted_at IS NOT NULL;
+"""
+
+# Trashed items, and items of a trashed collection, stay invisible until
+# they are restored or purged.
+_IN_LIVE_COLLECTION = (
+    "NOT EXISTS (SELECT 1 FROM collections c WHERE c.user_email = items.user_email "
+    "AND c.id = items.collection_id AND c.deleted_at IS NOT NULL)"
+)
+_LIVE_ITEM = f"items.deleted_at IS NULL AND {_IN_LIVE_COLLECTION}"
+# A collection's item_count as recounted from its items.
+_ITEM_COUNT = (
+    "(SELECT COUNT(*) FROM items WHERE items.user_email = collections.user_email "
+    "AND items.collection_id = collections.id AND items.deleted_at IS NULL)"
+)
+_TRASH_LIMIT = 200
+
+# Stay below SQLite's default limit on host parameters per statement.
+_MAX_PARAMS = 500
+_COLLECTION_COLUMNS = "id, name, description, color, item_count, updated_at"
+_ITEM_COLUMNS = "id, name, description, tags, collection_id, created_at, updated_at"
+
+
+def _row_to_collection(row: tuple) -> Collection:
+    return {
+        "id": row[0],
+        "name": row[1],
+        "description": row[2],
+        "color": row[3],
+        "item_count": row[4],
+        "updated_at": row[5],
+    }
+
+
+def _row_to_item(row: tuple) -> Item:
+    return {
+        "id": row[0],
+        "name": row[1],
+        "description": row[2],
+        "tags": get_codec().loads(row[3]),
+        "collection_id": row[4],
+        "created_at": row[5],
+        "updated_at": row[6],
+    }
+
+
+def _collection_params(user_email: str, c: Collection) -> tuple:
+    return (
+        user_email,
+        c["id"],
+        c["name"],
+        c.get("description", ""),
+        c["color"],
+        c.get("item_count", 0),
+        c["updated_at"],
+    )
+
+
+def _item_params(user_email: str, i: Item) -> tuple:
+    return (
+        user_email,
+        i["id"],
+        i["collection_id"],
+        i["name"],
+        i.get("description", ""),
+        get_codec().dumps(i.get("tags", [])),
+        i["created_at"],
+        i["updated_at"],
+    )
+
+
+class SQLiteRepository(Repository):
+    """Repository backed by an embedded SQLite database.
+
+    Rows keep their insertion rowid across updates, so listing by descending
+    rowid returns records newest first like the old prepend-to-list storage.
+    Every table is keyed by user email first, and each write bumps the user's
+    row in ``partitions`` within the same transaction.
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            if path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+            self._add_missing_columns()
+            self._conn.executescript(_INDEXES)
+
+    def _add_missing_columns(self):
+        for table, column, definition in _ADDED_COLUMNS:
+            existing = {
+                row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")
+            }
+            if column not in existing:
+                self._conn.execute(
+                    f"ALTER TABLE {table} ADD COLUMN {column} {definition}"
+                )
+
+    def _bump_partition(self, user_email: str):
+        self._conn.execute(
+            "INSERT INTO partitions (user_email, version) VALUES (?, 1) "
+            "ON CONFLICT (user_email) DO UPDATE SET version = version + 1",
+            (user_email,),
+        )
+
+    def _make_newest(self, user_email: str, item_ids: list[str]):
+        """Renumber items past every other row, keeping their given order.
+
+        Items list newest first by rowid, and the item index treats moved and
+        restored items as the newest, so their rows are renumbered to match.
+        """
+        (top,) = self._conn.execute(
+            "SELECT COALESCE(MAX(rowid), 0) FROM items"
+        ).fetchone()
+        self._conn.executemany(
+            "UPDATE items SET rowid = ? WHERE user_email = ? AND id = ?",
+            ((top + n, user_email, item_id) for n, item_id in enumerate(item_ids, 1)),
+        )
+
+    def partition_version(self, user_email: str) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version FROM partitions WHERE user_email = ?", (user_email,)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def list_collections(self, user_email: str) -> list[Collection]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {_COLLECTION_COLUMNS} FROM collections "
+                "WHERE user_email = ? AND deleted_at IS NULL ORDER BY rowid DESC",
+                (user_email,),
+            ).fetchall()
+        return [_row_to_collection(r) for r in rows]
+
+    def count_collections(self, user_email: str) -> int:
+        with self._lock:
+            (count,) = self._conn.execute(
+                "SELECT COUNT(*) FROM collections "
+                "WHERE user_email = ? AND deleted_at IS NULL",
+                (user_email,),
+            ).fetchone()
+        return count
+
+    def get_collection(
+        self, user_email: str, collection_id: str
+    ) -> Optional[Collection]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {_COLLECTION_COLUMNS} FROM collections "
+                "WHERE user_email = ? AND id = ? AND deleted_at IS NULL",
+                (user_email, collection_id),
+            ).fetchone()
+        return _row_to_collection(row) if row else None
+
+    def put_collection(self, user_email: str, collection: Collection) -> None:
+        # An existing collection keeps its stored item_count: the caller's copy
+        # may predate item writes, and counts only change with the items.
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO collections (user_email, id, name, description, color, "
+                "item_count, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (user_email, id) DO UPDATE SET name = excluded.name, "
+                "description = excluded.description, color = excluded.color, "
+                "updated_at = excluded.updated_at",
+                _collection_params(user_email, collection),
+            )
+            self._bump_partition(user_email)
+
+    def delete_collection(
+        self, user_email: str, collection_id: str, deleted_at: str
+    ) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE collections SET deleted_at = ? "
+                "WHERE user_email = ? AND id = ? AND deleted_at IS NULL",
+                (deleted_at, user_email, collection_id),
+            )
+            self._bump_partition(user_email)
+
+    def restore_collection(self, user_email: str, collection_id: str) -> bool:
+        with self._lock, self._conn:
+            restored = self._conn.execute(
+                "UPDATE collections SET deleted_at = NULL "
+                "WHERE user_email = ? AND id = ? AND deleted_at IS NOT NULL",
+                (user_email, collection_id),
+            ).rowcount
+            if restored:
+                # A purge may have removed some of its items already.
+                self._recount_items(user_email, collection_id)
+                self._make_newest(
+                    user_email,
+                    [
+                        item_id
+                        for (item_id,) in self._conn.execute(
+                            "SELECT id FROM items WHERE user_email = ? "
+                            "AND collection_id = ? AND deleted_at IS NULL "
+                            "ORDER BY rowid",
+                            (user_email, collection_id),
+                        )
+                    ],
+                )
+                self._bump_partition(user_email)
+        return bool(restored)
+
+    def purge_deleted(self, deleted_before: str, batch_size: int = 1000) -> int:
+        with self._lock:
+            collections = self._conn.execute(
+                "SELECT user_email, id FROM collections "
+                "WHERE deleted_at IS NOT NULL AND deleted_at < ?",
+                (deleted_before,),
+            ).fetchall()
+        purged = 0
+        # Each batch is its own transaction, so other writers interleave. A
+        # collection restored, or restored and trashed again, meanwhile must
+        # keep its remaining items, so every batch checks that it is still in
+        # the trash from before the cutoff.
+        for user_email, collection_id in collections:
+            while True:
+                with self._lock, self._conn:
+                    deleted = self._conn.execute(
+                        "DELETE FROM items WHERE rowid IN (SELECT rowid FROM items "
+                        "WHERE user_email = ? AND collection_id = ? AND EXISTS "
+                        "(SELECT 1 FROM collections c WHERE c.user_email = "
+                        "items.user_email AND c.id = items.collection_id "
+                        "AND c.deleted_at IS NOT NULL AND c.deleted_at < ?) LIMIT ?)",
+                        (user_email, collection_id, deleted_before, batch_size),
+                    ).rowcount
+                    done = deleted < batch_size
+                    if done:
+                        removed = self._conn.execute(
+                            "DELETE FROM collections WHERE user_email = ? AND id = ? "
+                            "AND deleted_at IS NOT NULL AND deleted_at < ?",
+                            (user_email, collection_id, deleted_before),
+                        ).rowcount
+                        purged += removed
+                        deleted += removed
+                    if deleted:
+                        self._bump_partition(user_email)
+                if done:
+                    break
+        while True:
+            with self._lock, self._conn:
+                users = self._conn.execute(
+                    "DELETE FROM items WHERE rowid IN (SELECT rowid FROM items "
+                    "WHERE deleted_at IS NOT NULL AND deleted_at < ? LIMIT ?) "
+                    "RETURNING user_email",
+                    (deleted_before, batch_size),
+                ).fetchall()
+                for user_email in {user_email for (user_email,) in users}:
+                    self._bump_partition(user_email)
+            purged += len(users)
+            if len(users) < batch_size:
+                return purged
+
+    def list_deleted_collections(
+        self, user_email: str
+    ) -> list[tuple[Collection, str]]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {_COLLECTION_COLUMNS}, deleted_at FROM collections "
+                "WHERE user_email = ? AND deleted_at IS NOT NULL "
+                "ORDER BY deleted_at DESC LIMIT ?",
+                (user_email, _TRASH_LIMIT),
+            ).fetchall()
+        return [(_row_to_collection(r[:-1]), r[-1]) for r in rows]
+
+    def list_deleted_items(self, user_email: str) -> list[tuple[Item, str]]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {_ITEM_COLUMNS}, deleted_at FROM items "
+                "WHERE user_email = ? AND deleted_at IS NOT NULL "
+                f"AND {_IN_LIVE_COLLECTION} ORDER BY deleted_at DESC LIMIT ?",
+                (user_email, _TRASH_LIMIT),
+            ).fetchall()
+        return [(_row_to_item(r[:-1]), r[-1]) for r in rows]
+
+    def _adjust_collection(
+        self, user_email: str, collection_id: str, item_delta: int, updated_at: str
+    ):
+        self._conn.execute(
+            "UPDATE collections SET item_count = item_count + ?, updated_at = ? "
+            "WHERE user_email = ? AND id = ?",
+            (item_delta, updated_at, user_email, collection_id),
+        )
+
+    def _recount_items(self, user_email: str, collection_id: Optional[str] = None):
+        query = f"UPDATE collections SET item_count = {_ITEM_COUNT} WHERE user_email = ?"
+        if collection_id is None:
+            self._conn.execute(query, (user_email,))
+        else:
+            self._conn.execute(query + " AND id = ?", (user_email, collection_id))
+
+    def _item_collections(self, user_email: str, item_ids: list[str]) -> dict:
+        """Map each live item id to its collection id."""
+        found = {}
+        for start in range(0, len(item_ids), _MAX_PARAMS):
+            chunk = item_ids[start : start + _MAX_PARAMS]
+            placeholders = ", ".join("?" * len(chunk))
+            found.update(
+                self._conn.execute(
+                    "SELECT id, collection_id FROM items WHERE user_email = ? "
+                    f"AND deleted_at IS NULL AND id IN ({placeholders})",
+                    (user_email, *chunk),
+                ).fetchall()
+            )
+        return found
+
+    def _adjust_collections(
+        self, user_email: str, item_deltas: dict[str, int], updated_at: str
+    ) -> None:
+        for collection_id, item_delta in item_deltas.items():
+            self._adjust_collection(user_email, collection_id, item_delta, updated_at)
+
+    def list_items(
+        self, user_email: str, collection_id: Optional[str] = None
+    ) -> list[Item]:
+        with self._lock:
+            if collection_id is None:
+                rows = self._conn.execute(
+                    f"SELECT {_ITEM_COLUMNS} FROM items "
+                    f"WHERE user_email = ? AND {_LIVE_ITEM} ORDER BY rowid DESC",
+                    (user_email,),
+                ).fetchall()
+            else:
+                rows = self._conn.execute(
+                    f"SELECT {_ITEM_COLUMNS} FROM items WHERE user_email = ? "
+                    f"AND collection_id = ? AND {_LIVE_ITEM} ORDER BY rowid DESC",
+                    (user_email, collection_id),
+                ).fetchall()
+        return [_row_to_item(r) for r in rows]
+
+    def iter_items(self, user_email: str, batch_size: int = 1000) -> Iterator[Item]:
+        # Keyset pagination: the lock is only held while fetching each batch.
+        last_rowid = None
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT rowid, {_ITEM_COLUMNS} FROM items WHERE user_email = ? "
+                    f"AND (? IS NULL OR rowid < ?) AND {_LIVE_ITEM} "
+                    "ORDER BY rowid DESC LIMIT ?",
+                    (user_email, last_rowid, last_rowid, batch_size),
+                ).fetchall()
+            for row in rows:
+                yield _row_to_item(row[1:])
+            if len(rows) < batch_size:
+                return
+            last_rowid = rows[-1][0]
+
+    def get_item(self, user_email: str, item_id: str) -> Optional[Item]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {_ITEM_COLUMNS} FROM items "
+                f"WHERE user_email = ? AND id = ? AND {_LIVE_ITEM}",
+                (user_email, item_id),
+            ).fetchone()
+        return _row_to_item(row) if row else None
+
+    def put_item(self, user_email: str, item: Item) -> Optional[Collection]:
+        with self._lock, self._conn:
+            previous = self._conn.execute(
+                "SELECT collection_id FROM items "
+                "WHERE user_email = ? AND id = ? AND deleted_at IS NULL",
+                (user_email, item["id"]),
+            ).fetchone()
+            self._conn.execute(
+                "INSERT INTO items (user_email, id, collection_id, name, description, "
+                "tags, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (user_email, id) DO UPDATE SET "
+                "collection_id = excluded.collection_id, name = excluded.name, "
+                "description = excluded.description, tags = excluded.tags, "
+                "updated_at = excluded.updated_at, deleted_at = NULL",
+                _item_params(user_email, item),
+            )
+            collection_id = item["collection_id"]
+            if previous is None or previous[0] != collection_id:
+                self._make_newest(user_email, [item["id"]])
+            if previous is not None and previous[0] != collection_id:
+                self._adjust_collection(
+                    user_email, previous[0], -1, item["updated_at"]
+                )
+            self._adjust_collection(
+                user_email,
+                collection_id,
+                0 if previous is not None and previous[0] == collection_id else 1,
+                item["updated_at"],
+            )
+            self._bump_partition(user_email)
+        return self.get_collection(user_email, collection_id)
+
+    def add_items(
+        self,
+        user_email: str,
+        collection_id: str,
+        items: Iterable[Item],
+        updated_at: str,
+    ) -> int:
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT INTO items (user_email, id, collection_id, name, description, "
+                "tags, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (_item_params(user_email, i) for i in items),
+            )
+            added = self._conn.total_changes - before
+            if added:
+                self._adjust_collection(user_email, collection_id, added, updated_at)
+                self._bump_partition(user_email)
+        return added
+
+    def put_items(
+        self, user_email: str, items: list[Item], updated_at: str
+    ) -> list[Collection]:
+        if not items:
+            return []
+        with self._lock, self._conn:
+            previous = self._item_collections(user_email, [i["id"] for i in items])
+            self._conn.executemany(
+                "INSERT INTO items (user_email, id, collection_id, name, description, "
+                "tags, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (user_email, id) DO UPDATE SET "
+                "collection_id = excluded.collection_id, name = excluded.name, "
+                "description = excluded.description, tags = excluded.tags, "
+                "updated_at = excluded.updated_at, deleted_at = NULL",
+                (_item_params(user_email, i) for i in items),
+            )
+            self._make_newest(
+                user_email,
+                [i["id"] for i in items if previous.get(i["id"]) != i["collection_id"]],
+            )
+            item_deltas: dict[str, int] = {}
+            for item in items:
+                collection_id = item["collection_id"]
+                old_collection_id = previous.get(item["id"])
+                if old_collection_id == collection_id:
+                    item_deltas.setdefault(collection_id, 0)
+                    continue
+                item_deltas[collection_id] = item_deltas.get(collection_id, 0) + 1
+                if old_collection_id is not None:
+                    item_deltas[old_collection_id] = (
+                        item_deltas.get(old_collection_id, 0) - 1
+                    )
+            self._adjust_collections(user_email, item_deltas, updated_at)
+            self._bump_partition(user_email)
+        return [
+            c
+            for c in (self.get_collection(user_email, cid) for cid in item_deltas)
+            if c is not None
+        ]
+
+    def update_items(
+        self, user_email: str, items: list[Item], updated_at: str
+    ) -> list[Collection]:
+        if not items:
+            return []
+        with self._lock, self._conn:
+            live = self._item_collections(user_email, [i["id"] for i in items])
+            self._conn.executemany(
+                "UPDATE items SET name = ?, description = ?, tags = ?, updated_at = ? "
+                "WHERE user_email = ? AND id = ? AND deleted_at IS NULL",
+                (
+                    (
+                        i["name"],
+                        i.get("description", ""),
+                        get_codec().dumps(i.get("tags", [])),
+                        i["updated_at"],
+                        user_email,
+                        i["id"],
+                    )
+                    for i in items
+                    if i["id"] in live
+                ),
+            )
+            item_deltas = dict.fromkeys(live.values(), 0)
+            self._adjust_collections(user_email, item_deltas, updated_at)
+            self._bump_partition(user_email)
+        return [
+            c
+            for c in (self.get_collection(user_email, cid) for cid in item_deltas)
+            if c is not None
+        ]
+
+    def delete_items(
+        self, user_email: str, item_ids: list[str], updated_at: str
+    ) -> list[Collection]:
+        with self._lock, self._conn:
+            existing = self._item_collections(user_email, list(item_ids))
+            if not existing:
+                return []
+            self._conn.executemany(
+                "UPDATE items SET deleted_at = ? WHERE user_email = ? AND id = ?",
+                ((updated_at, user_email, item_id) for item_id in existing),
+            )
+            item_deltas: dict[str, int] = {}
+            for collection_id in existing.values():
+                item_deltas[collection_id] = item_deltas.get(collection_id, 0) - 1
+            self._adjust_collections(user_email, item_deltas, updated_at)
+            self._bump_partition(user_email)
+        return [
+            c
+            for c in (self.get_collection(user_email, cid) for cid in item_deltas)
+            if c is not None
+        ]
+
+    def delete_item(
+        self, user_email: str, item_id: str, updated_at: str
+    ) -> Optional[Collection]:
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT collection_id FROM items "
+                "WHERE user_email = ? AND id = ? AND deleted_at IS NULL",
+                (user_email, item_id),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE items SET deleted_at = ? WHERE user_email = ? AND id = ?",
+                (updated_at, user_email, item_id),
+            )
+            self._adjust_collection(user_email, row[0], -1, updated_at)
+            self._bump_partition(user_email)
+        return self.get_collection(user_email, row[0])
+
+    def restore_item(
+        self, user_email: str, item_id: str, updated_at: str
+    ) -> Optional[Collection]:
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT collection_id FROM items WHERE user_email = ? AND id = ? "
+                f"AND deleted_at IS NOT NULL AND {_IN_LIVE_COLLECTION}",
+                (user_email, item_id),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE items SET deleted_at = NULL WHERE user_email = ? AND id = ?",
+                (user_email, item_id),
+            )
+            self._make_newest(user_email, [item_id])
+            self._adjust_collection(user_email, row[0], 1, updated_at)
+            self._bump_partition(user_email)
+        return self.get_collection(user_email, row[0])
+
+    def reconcile_item_counts(self) -> int:
+        # The full scan runs on its own connection, reading a WAL snapshot
+        # without holding the lock every write waits on. Only an in-memory
+        # database, which a second connection cannot see, scans under it.
+        query = (
+            "SELECT c.user_email, c.id FROM collections c "
+            "LEFT JOIN items i ON i.user_email = c.user_email "
+            "AND i.collection_id = c.id AND i.deleted_at IS NULL "
+            "GROUP BY c.user_email, c.id HAVING COUNT(i.id) != c.item_count"
+        )
+        if self._path == ":memory:":
+            with self._lock:
+                candidates = self._conn.execute(query).fetchall()
+        else:
+            reader = sqlite3.connect(self._path)
+            try:
+                candidates = reader.execute(query).fetchall()
+            finally:
+                reader.close()
+        if not candidates:
+            return 0
+        # Writes may have moved on since the snapshot, so each candidate is
+        # recounted and only updated if it still disagrees.
+        repaired = 0
+        with self._lock, self._conn:
+            for user_email, collection_id in candidates:
+                changed = self._conn.execute(
+                    f"UPDATE collections SET item_count = {_ITEM_COUNT} "
+                    f"WHERE user_email = ? AND id = ? AND item_count != {_ITEM_COUNT}",
+                    (user_email, collection_id),
+                ).rowcount
+                if changed:
+                    repaired += 1
+                    self._bump_partition(user_email)
+        return repaired
+
+    def import_records(
+        self, user_email: str, collections: list[Collection], items: list[Item]
+    ) -> int:
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO collections (user_email, id, name, "
+                "description, color, item_count, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (_collection_params(user_email, c) for c in reversed(collections)),
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO items (user_email, id, collection_id, name, "
+                "description, tags, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (_item_params(user_email, i) for i in reversed(items)),
+            )
+            imported = self._conn.total_changes - before
+            if imported:
+                self._recount_items(user_email)
+                self._bump_partition(user_email)
+            return imported
+
+    def create_user(self, user_email: str, password_hash: str, created_at: str) -> bool:
+        with self._lock, self._conn:
+            return bool(
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO users (email, password_hash, created_at) "
+                    "VALUES (?, ?, ?)",
+                    (user_email, password_hash, created_at),
+                ).rowcount
+            )
+
+    def get_password_hash(self, user_email: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT password_hash FROM users WHERE email = ?", (user_email,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def create_session(self, token_hash: str, user_email: str, expires_at: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO sessions (token_hash, user_email, expires_at) "
+                "VALUES (?, ?, ?)",
+                (token_hash, user_email, expires_at),
+            )
+
+    def get_session_email(self, token_hash: str, now: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT user_email FROM sessions "
+                "WHERE token_hash = ? AND expires_at > ?",
+                (token_hash, now),
+            ).fetchone()
+        return row[0] if row else None
+
+    def delete_session(self, token_hash: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM sessions WHERE token_hash = ?", (token_hash,)
+            )
+
+    def delete_expired_sessions(self, now: str) -> int:
+        with self._lock, self._conn:
+            return self._conn.execute(
+                "DELETE FROM sessions WHERE expires_at <= ?", (now,)
+            ).rowcount
@@ -0,0 +1,140 @@
+from bisect import bisect_left, insort
+import functools
+import heapq
+from collections.abc import Collection
+from typing import Iterable, Optional
+
+
+@functools.lru_cache(maxsize=16384)
+def normalize_tag(tag: str) -> str:
+    """The form tags are compared and filtered by: trimmed, single spaced, casefolded."""
+    return " ".join(tag.split()).casefold()
+
+
+def parse_tags(text: str) -> list[str]:
+    """Split a comma separated tag field, dropping blanks and duplicates.
+
+    Tags keep the spelling they were typed with; two tags that normalize the
+    same are duplicates, and the first one wins.
+    """
+    tags: dict[str, str] = {}
+    for tag in text.split(","):
+        tag = " ".join(tag.split())
+        if tag:
+            tags.setdefault(normalize_tag(tag), tag)
+    return list(tags.values())
+
+
+class TagRegistry:
+    """Normalized tags of one user's items, with usage counts and postings.
+
+    ``postings`` maps each normalized tag to the ids of the items carrying it
+    (a dict used as an ordered set), so filtering by tags is a set operation
+    over those ids instead of a scan of the items. Per collection tag counts
+    back the facet list, and a sorted vocabulary serves prefix suggestions.
+    Callers pass an item's previous tags to ``remove``, so the registry does
+    not keep its own copy of them.
+    """
+
+    def __init__(self):
+        self.postings: dict[str, dict[str, None]] = {}
+        self.counts_by_collection: dict[str, dict[str, int]] = {}
+        self._vocabulary: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self.postings)
+
+    def count(self, tag: str) -> int:
+        """Return how many items carry a tag."""
+        return len(self.postings.get(normalize_tag(tag), {}))
+
+    def add(self, item_id: str, collection_id: str, tags: Iterable[str]):
+        """Register the tags of a new or re-added item."""
+        counts = self.counts_by_collection.setdefault(collection_id, {})
+        for tag in {normalize_tag(tag) for tag in tags}:
+            postings = self.postings.get(tag)
+            if postings is None:
+                postings = self.postings[tag] = {}
+                insort(self._vocabulary, tag)
+            postings[item_id] = None
+            counts[tag] = counts.get(tag, 0) + 1
+
+    def remove(self, item_id: str, collection_id: str, tags: Iterable[str]):
+        """Unregister the tags an item was added with."""
+        counts = self.counts_by_collection.get(collection_id, {})
+        for tag in {normalize_tag(tag) for tag in tags}:
+            postings = self.postings.get(tag)
+            if postings is None or item_id not in postings:
+                continue
+            del postings[item_id]
+            if counts.get(tag, 0) > 1:
+                counts[tag] -= 1
+            else:
+                counts.pop(tag, None)
+            if not postings:
+                del self.postings[tag]
+                del self._vocabulary[bisect_left(self._vocabulary, tag)]
+        if not counts:
+            self.counts_by_collection.pop(collection_id, None)
+
+    def facets(
+        self, collection_id: Optional[str] = None, limit: Optional[int] = None
+    ) -> list[tuple[str, int]]:
+        """Return (tag, count) pairs, most used first, for one collection or all."""
+        if collection_id is None:
+            counts = {tag: len(ids) for tag, ids in self.postings.items()}
+        else:
+            counts = self.counts_by_collection.get(collection_id, {})
+
+        def rank(e):
+            return (-e[1], e[0])
+
+        if limit is not None:
+            return heapq.nsmallest(limit, counts.items(), key=rank)
+        return sorted(counts.items(), key=rank)
+
+    def suggest(self, prefix: str, limit: int = 8) -> list[str]:
+        """Return the most used tags starting with a prefix."""
+        prefix = normalize_tag(prefix)
+        if not prefix:
+            return []
+        vocabulary = self._vocabulary
+        i = bisect_left(vocabulary, prefix)
+        matches = []
+        while i < len(vocabulary) and vocabulary[i].startswith(prefix):
+            matches.append(vocabulary[i])
+            i += 1
+        return heapq.nsmallest(
+            limit, matches, key=lambda tag: (-len(self.postings[tag]), tag)
+        )
+
+    def match(
+        self,
+        tags: Iterable[str],
+        match_all: bool = True,
+        within: Optional[Collection[str]] = None,
+    ) -> set[str]:
+        """Return the ids of items with every tag (or any, if not match_all).
+
+        If ``within`` is given, only those item ids are considered. Each step
+        walks the smaller side: intersections start from the rarest tag, and
+        a small ``within`` is checked against the postings rather than the
+        other way round.
+        """
+        postings = [self.postings.get(normalize_tag(tag), {}) for tag in tags]
+        if not postings:
+            return set()
+        if match_all:
+            postings.sort(key=len)
+            rarest, rest = postings[0], postings[1:]
+            if within is not None and len(within) < len(rarest):
+                rarest, rest = within, postings
+                within = None
+            ids = {i for i in rarest if all(i in p for p in rest)}
+        elif within is not None and len(within) < sum(len(p) for p in postings):
+            return {i for i in within if any(i in p for p in postings)}
+        else:
+            ids = set().union(*postings)
+        if within is not None:
+            ids = {i for i in ids if i in within}
+        return ids
@@ -0,0 +1,49 @@
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+
+from app.storage.repository import get_repository
+
+RECONCILE_INTERVAL_SECONDS = float(
+    os.environ.get("COLLECTIONS_RECONCILE_INTERVAL", "3600")
+)
+PURGE_INTERVAL_SECONDS = float(os.environ.get("COLLECTIONS_PURGE_INTERVAL", "600"))
+TRASH_RETENTION_DAYS = float(os.environ.get("COLLECTIONS_TRASH_RETENTION_DAYS", "30"))
+
+
+async def reconcile_item_counts():
+    """Periodically recount items per collection and repair drifted counts.
+
+    Counts are maintained atomically with every item write; this catches
+    anything that bypassed that path (manual edits, older data, crashes).
+    """
+    while True:
+        try:
+            repaired = await asyncio.to_thread(
+                get_repository().reconcile_item_counts
+            )
+            if repaired:
+                logging.warning(f"Repaired item counts of {repaired} collections.")
+        except Exception as e:
+            logging.exception(f"Error reconciling item counts: {e}")
+        await asyncio.sleep(RECONCILE_INTERVAL_SECONDS)
+
+
+async def purge_deleted():
+    """Periodically remove records that have been in the trash too long.
+
+    Deletes only flag records, so the interactive path stays a single small
+    write; this task removes expired rows in batches on a worker thread.
+    """
+    while True:
+        cutoff = datetime.now(timezone.utc) - timedelta(days=TRASH_RETENTION_DAYS)
+        try:
+            purged = await asyncio.to_thread(
+                get_repository().purge_deleted, cutoff.isoformat()
+            )
+            if purged:
+                logging.info(f"Purged {purged} records from the trash.")
+        except Exception as e:
+            logging.exception(f"Error purging the trash: {e}")
+        await asyncio.sleep(PURGE_INTERVAL_SECONDS)
@@ -0,0 +1,58 @@
+"""Compare the JSON codecs on item payloads.
+
+For each available codec (see ``app.storage.codec``) reports the time to
+encode a list of items, decode it back to dicts, decode it into normalized
+``Item`` records, and encode/decode the per-row tag lists the SQLite backend
+stores, as milliseconds and MB/s of JSON. The garbage collector is paused
+while timing, as timeit does, since decoding is mostly object allocation.
+
+Usage: python -m benchmarks.bench_codec [item_count ...]
+"""
+
+import gc
+import sys
+
+from app.storage.codec import available_codecs, set_codec
+from benchmarks.bench_search import timed
+from benchmarks.datagen import make_items
+
+
+def timed_nogc(fn) -> float:
+    gc.collect()
+    gc.disable()
+    try:
+        return timed(fn)
+    finally:
+        gc.enable()
+
+
+def run(count: int):
+    items = make_items(count)
+    tags = [item["tags"] for item in items]
+    print(f"\n{count} items")
+    print(
+        f"{'codec':<10}{'size MB':>9}{'encode ms':>11}{'MB/s':>8}"
+        f"{'decode ms':>11}{'MB/s':>8}{'typed ms':>10}{'tags ms':>9}"
+    )
+    for name in available_codecs():
+        codec = set_codec(name)
+        data = codec.dumps(items)
+        size = len(data.encode("utf-8")) / 1e6
+        encode_ms = timed_nogc(lambda: codec.dumps(items))
+        decode_ms = timed_nogc(lambda: codec.loads(data))
+        typed_ms = timed_nogc(lambda: codec.loads_items(data))
+        tags_ms = timed_nogc(
+            lambda: [codec.loads(t) for t in [codec.dumps(t) for t in tags]]
+        )
+        assert codec.loads_items(data) == items
+        print(
+            f"{name:<10}{size:>9.1f}{encode_ms:>11.1f}{size / encode_ms * 1000:>8.0f}"
+            f"{decode_ms:>11.1f}{size / decode_ms * 1000:>8.0f}"
+            f"{typed_ms:>10.1f}{tags_ms:>9.1f}"
+        )
+    set_codec(None)
+
+
+if __name__ == "__main__":
+    for count in [int(arg) for arg in sys.argv[1:]] or [100_000]:
+        run(count)
@@ -0,0 +1,90 @@
+"""Measure the state delta sent to the client after single item mutations.
+
+Reports, for a user with 48 collections, one of them holding the given number
+of items, the bytes of the delta produced by adding, editing and deleting one
+item in that collection. "whole list" is the size of the
+full item list that every mutation used to resend, and "all vars" is the
+delta when every data-derived var is invalidated, as a single data version
+did before item and collection invalidation were split.
+
+Usage: python -m benchmarks.bench_delta [item_count ...]
+"""
+
+import asyncio
+import json
+import sys
+
+from reflex.state import State
+
+import app.app  # noqa: F401  (registers the states)
+from app.states.auth_state import AuthState
+from app.states.collections_state import CollectionsState
+from app.storage.accounts import start_session
+from app.storage.repository import get_repository, set_repository
+from app.storage.sqlite import SQLiteRepository
+from benchmarks.datagen import make_items
+
+USER = "bench@example.com"
+COLLECTIONS = 48
+
+
+def make_states(user: str = USER) -> tuple[State, CollectionsState]:
+    root = State(_reflex_internal_init=True)
+    root.is_hydrated = True
+    auth_state = root.get_substate(AuthState.get_full_name().split(".")[1:])
+    auth_state.session_token = start_session(get_repository(), user)
+    state = root.get_substate(CollectionsState.get_full_name().split(".")[1:])
+    return root, state
+
+
+async def delta_size(root: State) -> int:
+    delta = await root._get_resolved_delta()
+    root._clean()
+    return len(json.dumps(delta, default=str))
+
+
+async def call(state: CollectionsState, handler: str, *args):
+    result = getattr(CollectionsState, handler).fn(state, *args)
+    if asyncio.iscoroutine(result):
+        await result
+
+
+async def run(count: int):
+    set_repository(SQLiteRepository(":memory:"))
+    root, state = make_states()
+    for n in range(COLLECTIONS):
+        await call(state, "handle_create_submit", {"name": f"Collection {n}"})
+    collection = (await state._collections())[0]
+    items = make_items(count, collections=1)
+    for item in items:
+        item["collection_id"] = collection["id"]
+    partition = await state._partition()
+    partition.import_records([], items)
+    state.current_collection = partition.get_collection(collection["id"])
+    state._mark_collections_changed()
+    state._mark_items_changed()
+    await delta_size(root)
+
+    whole_list = len(json.dumps(partition.list_items(collection["id"])))
+    state._mark_collections_changed()
+    state._mark_items_changed()
+    all_vars = await delta_size(root)
+
+    await call(state, "handle_create_item_submit", {"name": "new camera"})
+    add = await delta_size(root)
+    target = partition.list_items(collection["id"], 1)[0]
+    state.editing_item = target
+    await call(state, "handle_edit_item_submit", {"name": "edited camera"})
+    edit = await delta_size(root)
+    state.deleting_item_id = target["id"]
+    await call(state, "delete_item")
+    delete = await delta_size(root)
+    print(
+        f"{count:>8} items: whole list {whole_list:>10} B, all vars {all_vars:>7} B, "
+        f"add {add:>6} B, edit {edit:>6} B, delete {delete:>6} B"
+    )
+
+
+if __name__ == "__main__":
+    for count in [int(arg) for arg in sys.argv[1:]] or [100, 1_000, 20_000]:
+        asyncio.run(run(count))
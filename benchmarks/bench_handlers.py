@@ -0,0 +1,177 @@
+"""Benchmark CollectionsState event handlers against synthetic datasets.
+
+For each dataset (total items x users) every user gets 20 collections with
+the items spread evenly across them. Each handler is then driven round-robin
+over the users, and its latency (handler plus resolving the state delta,
+i.e. recomputing the dirty vars), the serialized delta size and the peak
+Python memory allocated while it runs are reported.
+
+Usage: python -m benchmarks.bench_handlers [--repeat N] [items:users ...]
+e.g.   python -m benchmarks.bench_handlers 100:1 10000:50
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from app.storage.cache import index_cache, partition_cache
+from app.storage.repository import set_repository
+from app.storage.sqlite import SQLiteRepository
+from benchmarks.bench_delta import call, delta_size, make_states
+from benchmarks.bench_search import QUERIES
+from benchmarks.datagen import make_items
+
+COLLECTIONS_PER_USER = 20
+DATASETS = [
+    (100, 1),
+    (100, 50),
+    (10_000, 1),
+    (10_000, 50),
+    (100_000, 1),
+    (100_000, 50),
+]
+SEARCH_HANDLERS = [
+    "set_search_query",
+    "set_item_search_query",
+    "set_global_search_query",
+]
+HANDLERS = [
+    *SEARCH_HANDLERS,
+    "handle_create_item_submit",
+    "handle_edit_item_submit",
+    "delete_item",
+    "delete_collection",
+]
+
+
+def percentile(samples: list[float], p: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+
+class Session:
+    """One simulated user: their states and the records the handlers act on."""
+
+    def __init__(self, user: str):
+        self.root, self.state = make_states(user)
+        self.collections: list[dict] = []
+
+    async def seed(self, item_count: int, seed: int):
+        for n in range(COLLECTIONS_PER_USER):
+            await call(self.state, "handle_create_submit", {"name": f"Collection {n}"})
+        self.collections = await self.state._collections()
+        items = make_items(item_count, collections=COLLECTIONS_PER_USER)
+        for item in items:
+            item["id"] = f"{seed}-{item['id']}"
+            index = int(item["collection_id"].rsplit("-", 1)[1])
+            item["collection_id"] = self.collections[index]["id"]
+        partition = await self.state._partition()
+        partition.import_records([], items)
+        await self.open_collection(self.collections[0])
+
+    async def open_collection(self, collection: dict):
+        partition = await self.state._partition()
+        self.state.current_collection = partition.get_collection(collection["id"])
+        self.state._mark_collections_changed()
+        self.state._mark_items_changed()
+        await delta_size(self.root)
+
+    async def first_item(self) -> dict:
+        partition = await self.state._partition()
+        return partition.list_items(self.state.current_collection["id"], 1)[0]
+
+
+async def prepare(session: Session, handler: str, n: int) -> tuple:
+    """Set up the state a handler expects and return its arguments."""
+    state = session.state
+    if handler in SEARCH_HANDLERS:
+        return (QUERIES[n % len(QUERIES)],)
+    if handler == "handle_create_item_submit":
+        return ({"name": f"bench item {n}", "tags": "bench, camera"},)
+    if handler == "handle_edit_item_submit":
+        state.editing_item = await session.first_item()
+        return ({"name": f"edited item {n}", "tags": "edited"},)
+    if handler == "delete_item":
+        state.deleting_item_id = (await session.first_item())["id"]
+        return ()
+    if handler == "delete_collection":
+        # Delete the open collection, then open the next one left.
+        state.deleting_collection_id = state.current_collection["id"]
+        return ()
+    raise ValueError(handler)
+
+
+async def measure(sessions: list[Session], handler: str, repeat: int) -> dict:
+    latencies, sizes, peaks = [], [], []
+    if handler == "delete_collection":
+        repeat = min(repeat, len(sessions) * (COLLECTIONS_PER_USER - 1))
+    for n in range(repeat):
+        session = sessions[n % len(sessions)]
+        args = await prepare(session, handler, n)
+        traced = n % 5 == 0
+        if traced:
+            tracemalloc.start()
+        start = time.perf_counter()
+        await call(session.state, handler, *args)
+        size = await delta_size(session.root)
+        elapsed = time.perf_counter() - start
+        if traced:
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        else:
+            latencies.append(elapsed * 1000)
+        sizes.append(size)
+        if handler == "delete_collection":
+            remaining = await session.state._collections()
+            await session.open_collection(remaining[0])
+    if handler in SEARCH_HANDLERS:
+        for session in sessions:
+            await call(session.state, handler, "")
+            await delta_size(session.root)
+    return {
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "delta": sum(sizes) / len(sizes),
+        "peak": max(peaks) / 1024,
+    }
+
+
+async def run(item_count: int, user_count: int, repeat: int):
+    set_repository(SQLiteRepository(":memory:"))
+    partition_cache.clear()
+    index_cache.clear()
+    sessions = [Session(f"user{n}@example.com") for n in range(user_count)]
+    start = time.perf_counter()
+    for n, session in enumerate(sessions):
+        await session.seed(item_count // user_count, n)
+    seed_s = time.perf_counter() - start
+    print(
+        f"\n{item_count} items, {user_count} users "
+        f"({item_count // user_count} items each, seeded in {seed_s:.1f} s)"
+    )
+    print(
+        f"{'handler':<28}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+        f"{'delta B':>10}{'peak KiB':>10}"
+    )
+    for handler in HANDLERS:
+        r = await measure(sessions, handler, repeat)
+        print(
+            f"{handler:<28}{r['p50']:>9.2f}{r['p95']:>9.2f}{r['p99']:>9.2f}"
+            f"{r['delta']:>10.0f}{r['peak']:>10.0f}"
+        )
+
+
+def parse_dataset(value: str) -> tuple[int, int]:
+    items, _, users = value.partition(":")
+    return int(items), int(users or 1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("datasets", nargs="*", type=parse_dataset)
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+    for item_count, user_count in args.datasets or DATASETS:
+        asyncio.run(run(item_count, user_count, args.repeat))
@@ -0,0 +1,92 @@
+"""Compare the item search index against the old per-keystroke substring scan,
+and tag filtering through the tag registry against a scan of the items.
+
+Usage: python -m benchmarks.bench_search [item_count ...]
+"""
+
+import sys
+import time
+
+from app.storage.index import ItemIndex
+from benchmarks.datagen import make_items
+
+QUERIES = [
+    "camera",
+    "vin",
+    "jazz vinyl",
+    "ilver",
+    "signed first edition",
+    "kalomi",
+    "zzz",
+]
+TAG_FILTERS = [
+    (["camera"], True),
+    (["camera", "lens"], True),
+    (["camera", "lens"], False),
+    (["zzz"], True),
+]
+
+
+def scan(items: list[dict], query: str, collection_id: str) -> list[dict]:
+    """The pre-index implementation of items_in_current_collection."""
+    filtered_items = [i for i in items if i["collection_id"] == collection_id]
+    query = query.lower()
+    return [
+        i
+        for i in filtered_items
+        if query in i["name"].lower()
+        or query in i["description"].lower()
+        or any((query in tag.lower() for tag in i["tags"]))
+    ]
+
+
+def scan_tags(
+    items: list[dict], tags: list[str], match_all: bool, collection_id: str
+) -> list[dict]:
+    """Tag filtering as a scan of the collection's items."""
+    match = all if match_all else any
+    return [
+        i
+        for i in items
+        if i["collection_id"] == collection_id
+        and match(tag in (t.lower() for t in i["tags"]) for tag in tags)
+    ]
+
+
+def timed(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run(count: int):
+    items = make_items(count)
+    start = time.perf_counter()
+    index = ItemIndex(items)
+    build_ms = (time.perf_counter() - start) * 1000
+    new_item = dict(items[0], id="new-item", name="freshly added camera")
+    add_ms = timed(lambda: index.update(new_item))
+    print(f"\n{count} items: index build {build_ms:.0f} ms, incremental add {add_ms:.3f} ms")
+    print(f"{'query':<24}{'scan ms':>10}{'index ms':>10}{'hits':>8}")
+    for query in QUERIES:
+        scan_ms = timed(lambda: scan(items, query, "collection-3"))
+        index_ms = timed(lambda: index.search_items(query, "collection-3"))
+        hits = len(index.search_items(query, "collection-3"))
+        print(f"{query:<24}{scan_ms:>10.2f}{index_ms:>10.2f}{hits:>8}")
+    print(f"{'tags':<24}{'scan ms':>10}{'index ms':>10}{'hits':>8}")
+    for tags, match_all in TAG_FILTERS:
+        scan_ms = timed(lambda: scan_tags(items, tags, match_all, "collection-3"))
+        index_ms = timed(
+            lambda: index.items_in("collection-3", tags=tags, match_all=match_all)
+        )
+        hits = len(index.items_in("collection-3", tags=tags, match_all=match_all))
+        label = (" & " if match_all else " | ").join(tags)
+        print(f"{label:<24}{scan_ms:>10.2f}{index_ms:>10.2f}{hits:>8}")
+
+
+if __name__ == "__main__":
+    for count in [int(arg) for arg in sys.argv[1:]] or [1_000, 10_000, 50_000]:
+        run(count)
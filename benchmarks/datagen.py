@@ -0,0 +1,83 @@
+"""Deterministic synthetic collections and items for benchmarks and load tests.
+
+The same arguments always produce the same records, ids included, so runs
+against different versions of the app are comparable.
+"""
+
+from typing import Optional
+from datetime import datetime, timedelta, timezone
+import random
+
+from app.models import Collection, Color, Item
+from app.storage.repository import Repository
+
+WORDS = [
+    "vintage", "camera", "lens", "film", "record", "vinyl", "jazz", "blues",
+    "stamp", "coin", "silver", "gold", "poster", "comic", "marvel", "book",
+    "first", "edition", "signed", "print", "map", "atlas", "watch", "swiss",
+    "card", "rookie", "mint", "sealed", "figure", "model", "train", "brass",
+]
+SYLLABLES = ["ka", "lo", "mi", "ren", "tor", "vex", "sul", "dra", "pin", "quo"]
+COLORS: list[Color] = ["orange", "blue", "green", "purple", "pink", "gray"]
+TIMESTAMP = "2025-01-01T00:00:00+00:00"
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def item_timestamp(n: int) -> str:
+    """A distinct timestamp per item, formatted like the app writes them."""
+    return (START + timedelta(microseconds=n * 61_234_567)).isoformat()
+
+
+def make_vocabulary(rng: random.Random, size: int = 5_000) -> list[str]:
+    """Common collector words plus a long tail of rarer pseudo-words."""
+    tail = {"".join(rng.choices(SYLLABLES, k=3)) for _ in range(size)}
+    return WORDS + sorted(tail)
+
+
+def make_collections(count: int, seed: int = 0) -> list[Collection]:
+    """Collections with ids ``collection-0`` .. ``collection-{count-1}``."""
+    rng = random.Random(seed)
+    return [
+        {
+            "id": f"collection-{n}",
+            "name": " ".join(rng.choices(WORDS, k=2)).title(),
+            "description": " ".join(rng.choices(WORDS, k=6)),
+            "color": COLORS[n % len(COLORS)],
+            "item_count": 0,
+            "updated_at": TIMESTAMP,
+        }
+        for n in range(count)
+    ]
+
+
+def make_items(
+    count: int, collections: int = 20, seed: Optional[int] = None
+) -> list[Item]:
+    """Items spread round-robin over ``collection-0`` .. ``collection-{collections-1}``."""
+    rng = random.Random(count if seed is None else seed)
+    vocabulary = make_vocabulary(rng)
+    return [
+        {
+            "id": f"item-{n}",
+            "name": " ".join(rng.choices(WORDS, k=2) + rng.choices(vocabulary, k=2)),
+            "description": " ".join(
+                rng.choices(WORDS, k=4) + rng.choices(vocabulary, k=8)
+            ),
+            "tags": rng.sample(WORDS, k=2),
+            "collection_id": f"collection-{n % collections}",
+            "created_at": item_timestamp(n),
+            "updated_at": item_timestamp(n),
+        }
+        for n in range(count)
+    ]
+
+
+def seed_user(
+    repo: Repository, user_email: str, collections: int, items: int, seed: int = 0
+) -> int:
+    """Store a generated dataset for one user and return how many records were added."""
+    return repo.import_records(
+        user_email,
+        make_collections(collections, seed),
+        make_items(items, collections, seed),
+    )
@@ -0,0 +1,287 @@
+"""Load test the app through the Reflex event websocket.
+
+Seeds a database with ``datagen`` records, starts the backend on it
+(``reflex run --backend-only``) and runs concurrent simulated clients. Each
+client repeats a browser-like session: hydrate and log in, load the
+dashboard, open a collection, search it, add an item and edit it. Events the
+server chains (on_load handlers, redirects) are sent back in order like the
+frontend does, and each event is timed from emit until its final update.
+
+Needs the Socket.IO asyncio client: pip install "python-socketio[asyncio_client]"
+
+Usage: python -m benchmarks.load_test [--clients N] [--sessions N] [--items N]
+       python -m benchmarks.load_test --url http://localhost:8000 --db collections.db
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import subprocess
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+import httpx
+import reflex as rx
+import socketio
+from reflex.state import State
+
+from app.states.auth_state import AuthState
+from app.states.collections_state import CollectionsState
+from app.storage.accounts import hash_password
+from app.storage.sqlite import SQLiteRepository
+from benchmarks.bench_handlers import percentile
+from benchmarks.bench_search import QUERIES
+from benchmarks.datagen import seed_user
+
+PASSWORD = "load-test-password"
+EVENT_TIMEOUT_SECONDS = 60
+FIELD_MARKER = "_rx_state_"
+NAMESPACE = rx.config.get_config().get_event_namespace()
+HYDRATE = f"{State.get_full_name()}.hydrate"
+ON_LOAD = (
+    f"{State.get_full_name()}.reflex___state____on_load_internal_state"
+    ".on_load_internal"
+)
+AUTH = AuthState.get_full_name()
+COLLECTIONS = CollectionsState.get_full_name()
+
+
+def user_email(n: int) -> str:
+    return f"load{n}@example.com"
+
+
+class Stats:
+    """Latencies of every event sent, grouped by handler name."""
+
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = {}
+        self.errors = 0
+
+    def record(self, name: str, seconds: float):
+        handler = name.rpartition(".")[2]
+        self.latencies.setdefault(handler, []).append(seconds * 1000)
+
+    def report(self, elapsed: float):
+        events = sum(len(samples) for samples in self.latencies.values())
+        print(
+            f"\n{events} events in {elapsed:.1f} s: {events / elapsed:.1f} events/s, "
+            f"{self.errors} failed sessions"
+        )
+        print(f"{'event':<30}{'count':>8}{'p50 ms':>10}{'p99 ms':>10}")
+        everything = []
+        for handler, samples in sorted(self.latencies.items()):
+            everything.extend(samples)
+            print(
+                f"{handler:<30}{len(samples):>8}"
+                f"{percentile(samples, 50):>10.2f}{percentile(samples, 99):>10.2f}"
+            )
+        if everything:
+            print(
+                f"{'all':<30}{len(everything):>8}"
+                f"{percentile(everything, 50):>10.2f}{percentile(everything, 99):>10.2f}"
+            )
+
+
+class Client:
+    """A simulated browser tab talking to the backend over Socket.IO."""
+
+    def __init__(self, url: str, stats: Stats):
+        self.url = url
+        self.stats = stats
+        self.token = str(uuid.uuid4())
+        self.path = "/"
+        self.query: dict = {}
+        self.vars: dict = {}
+        self.chained: list[dict] = []
+        self.done: Optional[asyncio.Future] = None
+        self.sio = socketio.AsyncClient(reconnection=False)
+        self.sio.on("event", self._on_update, namespace=NAMESPACE)
+
+    async def connect(self):
+        await self.sio.connect(
+            f"{self.url}?token={self.token}",
+            transports=["websocket"],
+            namespaces=[NAMESPACE],
+            socketio_path=NAMESPACE,
+        )
+
+    async def disconnect(self):
+        await self.sio.disconnect()
+
+    def _on_update(self, update: dict):
+        for substate in update.get("delta", {}).values():
+            for name, value in substate.items():
+                self.vars[name.removesuffix(FIELD_MARKER)] = value
+        for event in update.get("events", []):
+            if event["name"] == "_redirect":
+                self.navigate(event["payload"]["path"])
+                self.chained.append({"name": ON_LOAD, "payload": {}})
+            elif not event["name"].startswith("_"):
+                self.chained.append(event)
+        if update.get("final", True) and self.done and not self.done.done():
+            self.done.set_result(None)
+
+    def navigate(self, path: str, query: Optional[dict] = None):
+        """Change the page sent as router data with the following events."""
+        self.path = path
+        self.query = query or {}
+
+    async def open(self, path: str, query: Optional[dict] = None):
+        """Navigate to a page and run its on_load handlers, like the router does."""
+        self.navigate(path, query)
+        await self.send(ON_LOAD)
+
+    async def _emit(self, name: str, payload: dict):
+        self.done = asyncio.get_running_loop().create_future()
+        start = time.perf_counter()
+        await self.sio.emit(
+            "event",
+            {
+                "name": name,
+                "payload": payload,
+                "token": self.token,
+                "handler": None,
+                "event_actions": {},
+                "router_data": {
+                    "pathname": self.path,
+                    "query": self.query,
+                    "asPath": self.path,
+                },
+            },
+            namespace=NAMESPACE,
+        )
+        await asyncio.wait_for(self.done, EVENT_TIMEOUT_SECONDS)
+        self.stats.record(name, time.perf_counter() - start)
+
+    async def send(self, name: str, **payload):
+        """Send an event, then every event the server chains after it."""
+        await self._emit(name, payload)
+        while self.chained:
+            event = self.chained.pop(0)
+            await self._emit(event["name"], event.get("payload", {}))
+
+
+async def run_session(url: str, n: int, stats: Stats):
+    client = Client(url, stats)
+    await client.connect()
+    try:
+        email = user_email(n)
+        client.navigate("/login")
+        await client.send(HYDRATE)
+        await client.open("/login")
+        await client.send(
+            f"{AUTH}.login", form_data={"email": email, "password": PASSWORD}
+        )
+        collections = client.vars.get("filtered_collections") or []
+        if not collections:
+            raise RuntimeError(f"No collections loaded for {email}")
+        collection = collections[n % len(collections)]
+        await client.open(
+            f"/collections/{collection['id']}", {"collection_id": collection["id"]}
+        )
+        for query in QUERIES[n % len(QUERIES) :][:2]:
+            await client.send(f"{COLLECTIONS}.set_item_search_query", query=query)
+        await client.send(f"{COLLECTIONS}.set_item_search_query", query="")
+        await client.send(
+            f"{COLLECTIONS}.handle_create_item_submit",
+            form_data={
+                "name": f"load test item {uuid.uuid4().hex[:8]}",
+                "description": "added by the load test",
+                "tags": "load, test",
+            },
+        )
+        item = client.vars["items_in_current_collection"][0]
+        await client.send(f"{COLLECTIONS}.open_edit_item_modal", item=item)
+        await client.send(
+            f"{COLLECTIONS}.handle_edit_item_submit",
+            form_data={
+                "name": f"{item['name']} (edited)",
+                "description": item["description"],
+                "tags": ", ".join(item["tags"]),
+            },
+        )
+    finally:
+        await client.disconnect()
+
+
+async def run_client(url: str, n: int, sessions: int, stats: Stats):
+    for _ in range(sessions):
+        try:
+            await run_session(url, n, stats)
+        except Exception as e:
+            stats.errors += 1
+            print(f"Session of {user_email(n)} failed: {e!r}")
+
+
+def seed(db_path: str, clients: int, collections: int, items: int):
+    repo = SQLiteRepository(db_path)
+    password_hash = hash_password(PASSWORD)
+    now = datetime.now(timezone.utc).isoformat()
+    for n in range(clients):
+        repo.create_user(user_email(n), password_hash, now)
+        seed_user(repo, user_email(n), collections, items, seed=n)
+
+
+def start_backend(db_path: str, port: int) -> subprocess.Popen:
+    process = subprocess.Popen(
+        ["reflex", "run", "--backend-only", "--env", "prod", "--backend-port", str(port)],
+        cwd=Path(__file__).resolve().parents[1],
+        env={**os.environ, "COLLECTIONS_DB_PATH": db_path},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    url = f"http://localhost:{port}"
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{url}/ping").status_code == 200:
+                return process
+        except httpx.TransportError:
+            pass
+        time.sleep(0.5)
+    stop_backend(process)
+    raise RuntimeError("The backend did not start within 120 s")
+
+
+def stop_backend(process: subprocess.Popen):
+    os.killpg(process.pid, signal.SIGTERM)
+    process.wait()
+
+
+async def main(args):
+    stats = Stats()
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(run_client(args.url, n, args.sessions, stats) for n in range(args.clients))
+    )
+    stats.report(time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--sessions", type=int, default=3, help="per client")
+    parser.add_argument("--collections", type=int, default=20, help="per user")
+    parser.add_argument("--items", type=int, default=2_000, help="per user")
+    parser.add_argument("--port", type=int, default=8123)
+    parser.add_argument("--url", help="use a running backend instead of starting one")
+    parser.add_argument("--db", help="database to seed (default: a temporary file)")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = args.db or os.path.join(tmp, "load_test.db")
+        seed(db_path, args.clients, args.collections, args.items)
+        backend = None
+        if not args.url:
+            backend = start_backend(db_path, args.port)
+            args.url = f"http://localhost:{args.port}"
+        try:
+            asyncio.run(main(args))
+        finally:
+            if backend:
+                stop_backend(backend)
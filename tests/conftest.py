@@ -0,0 +1,54 @@
+import pytest
+
+from app.storage.cache import index_cache, partition_cache
+from app.storage.sqlite import SQLiteRepository
+
+USER = "ada@example.com"
+TIMESTAMP = "2025-01-01T00:00:00+00:00"
+
+
+def make_collection(collection_id: str) -> dict:
+    return {
+        "id": collection_id,
+        "name": f"Collection {collection_id}",
+        "description": "",
+        "color": "orange",
+        "item_count": 0,
+        "updated_at": TIMESTAMP,
+    }
+
+
+def make_item(item_id: str, collection_id: str, tags=(), name=None) -> dict:
+    return {
+        "id": item_id,
+        "name": name or f"Item {item_id}",
+        "description": "",
+        "tags": list(tags),
+        "collection_id": collection_id,
+        "created_at": TIMESTAMP,
+        "updated_at": TIMESTAMP,
+    }
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    # Cache entries are keyed by email and version, which a fresh database
+    # starts again from, so no entry may outlive its test.
+    partition_cache.clear()
+    index_cache.clear()
+    yield
+    partition_cache.clear()
+    index_cache.clear()
+
+
+@pytest.fixture
+def repository():
+    return SQLiteRepository(":memory:")
+
+
+@pytest.fixture
+def partition(repository):
+    partition = repository.partition(USER)
+    for collection_id in ("a", "b"):
+        partition.put_collection(make_collection(collection_id))
+    return partition
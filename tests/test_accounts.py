@@ -0,0 +1,41 @@
+from conftest import USER
+
+from app.storage.accounts import (
+    end_session,
+    hash_password,
+    session_email,
+    start_session,
+    verify_password,
+)
+
+NOW = "2025-01-01T00:00:00+00:00"
+
+
+def test_passwords_are_salted_and_verified():
+    password_hash = hash_password("correct horse")
+    assert password_hash != hash_password("correct horse")
+    assert verify_password("correct horse", password_hash)
+    assert not verify_password("wrong horse", password_hash)
+    assert not verify_password("correct horse", "not a hash")
+
+
+def test_an_email_is_registered_once(repository):
+    assert repository.create_user(USER, hash_password("first"), NOW)
+    assert not repository.create_user(USER, hash_password("second"), NOW)
+    assert verify_password("first", repository.get_password_hash(USER))
+    assert repository.get_password_hash("nobody@example.com") is None
+
+
+def test_sessions_resolve_only_their_own_token(repository):
+    token = start_session(repository, USER)
+    assert session_email(repository, token) == USER
+    assert session_email(repository, token + "x") is None
+    assert session_email(repository, "") is None
+    end_session(repository, token)
+    assert session_email(repository, token) is None
+
+
+def test_expired_sessions_are_rejected_and_removed(repository):
+    repository.create_session("hash", USER, NOW)
+    assert repository.get_session_email("hash", NOW) is None
+    assert repository.delete_expired_sessions(NOW) == 1
@@ -0,0 +1,24 @@
+from app.storage.cache import VersionedCache
+
+
+def test_weighed_cache_evicts_least_recent_values_over_budget():
+    cache = VersionedCache(max_weight=10, weigh=len)
+    cache.put("a", 1, [0] * 4)
+    cache.put("b", 1, [0] * 4)
+    cache.get("a", 1, list)
+    cache.put("c", 1, [0] * 4)
+    assert cache.peek("b", 1) is None
+    assert cache.peek("a", 1) is not None
+    assert cache.weight == 8
+
+
+def test_weighed_cache_reweighs_replaced_values_and_keeps_the_newest():
+    cache = VersionedCache(max_weight=10, weigh=len)
+    cache.put("a", 1, [0] * 4)
+    cache.put("a", 2, [0] * 6)
+    assert cache.weight == 6
+    cache.put("b", 1, [0] * 20)
+    assert cache.peek("a", 2) is None
+    assert cache.peek("b", 1) is not None
+    cache.invalidate("b")
+    assert cache.weight == 0
@@ -0,0 +1,73 @@
+from conftest import make_item
+
+from app.storage.index import ItemIndex
+
+
+def ids(records) -> list[str]:
+    return [record.id for record in records]
+
+
+def make_index() -> ItemIndex:
+    # Newest first, as the repository lists them.
+    return ItemIndex(
+        [
+            make_item(str(n), "a" if n % 2 else "b", [f"t{n % 3}", "All"])
+            for n in reversed(range(12))
+        ]
+    )
+
+
+def test_items_in_pages_through_a_collection_newest_first():
+    index = make_index()
+    everything = ids(index.items_in("a"))
+    assert everything == ["11", "9", "7", "5", "3", "1"]
+    pages = [ids(index.items_in("a", 4, offset=offset)) for offset in (0, 4, 8)]
+    assert pages == [everything[:4], everything[4:], []]
+
+
+def test_items_in_filters_by_tags():
+    index = make_index()
+    assert ids(index.items_in("a", tags=["T0"])) == ["9", "3"]
+    assert ids(index.items_in("a", tags=["t0", "t1"])) == []
+    assert ids(index.items_in("a", tags=["t0", "t1"], match_all=False)) == [
+        "9",
+        "7",
+        "3",
+        "1",
+    ]
+    assert ids(index.items_in("a", 2, ["t0", "t1"], False, offset=2)) == ["3", "1"]
+
+
+def test_search_items_pages_match_the_full_ranking():
+    index = make_index()
+    ranking = ids(index.search_items("item", "b"))
+    assert len(ranking) == 6
+    pages = ids(index.search_items("item", "b", 4)) + ids(
+        index.search_items("item", "b", 4, offset=4)
+    )
+    assert pages == ranking
+
+
+def test_update_moves_an_item_and_its_tags():
+    index = make_index()
+    index.update(make_item("1", "b", ["moved"]))
+    assert ids(index.items_in("b"))[0] == "1"
+    assert ids(index.all_items())[0] == "1"
+    assert "1" not in ids(index.items_in("a"))
+    assert index.count_in("a") == 5
+    assert index.count_in("b") == 7
+    assert dict(index.tags.facets("b"))["moved"] == 1
+    assert dict(index.tags.facets("a"))["t1"] == 1
+    assert index.get("1").to_item()["tags"] == ["moved"]
+
+
+def test_remove_and_remove_collection_drop_every_trace():
+    index = make_index()
+    assert index.remove("3").id == "3"
+    assert index.remove("3") is None
+    assert index.search_items("3") == []
+    assert sorted(index.remove_collection("a")) == ["1", "11", "5", "7", "9"]
+    assert ids(index.all_items()) == ["10", "8", "6", "4", "2", "0"]
+    assert index.tags.facets("a") == []
+    assert index.tags.count("all") == 6
+    assert index.search_items("item", "a") == []
@@ -0,0 +1,232 @@
+import asyncio
+
+from conftest import USER, make_collection, make_item
+
+from app.storage.index import ItemIndex
+from app.storage.sqlite import SQLiteRepository
+
+LATER = "2025-01-02T00:00:00+00:00"
+PURGE_BEFORE = "2100-01-01T00:00:00+00:00"
+
+
+def item_dicts(items) -> dict:
+    return {item["id"]: item for item in items}
+
+
+def ordered_ids(items) -> list[str]:
+    return [item["id"] for item in items]
+
+
+def assert_consistent(partition):
+    """Check item counts and the cached index, in order, against the database."""
+    repository = partition.repository
+    for collection in repository.list_collections(USER):
+        stored = repository.list_items(USER, collection["id"])
+        assert collection["item_count"] == len(stored), collection["id"]
+        indexed = partition.list_items(collection["id"])
+        assert item_dicts(indexed) == item_dicts(stored)
+        assert ordered_ids(indexed) == ordered_ids(stored)
+    stored = repository.list_items(USER)
+    assert item_dicts(partition.list_items()) == item_dicts(stored)
+    assert ordered_ids(partition.list_items()) == ordered_ids(stored)
+    rebuilt = ItemIndex(stored)
+    assert partition.tag_facets() == [
+        {"tag": tag, "count": count} for tag, count in rebuilt.tags.facets()
+    ]
+
+
+def counts(partition) -> dict[str, int]:
+    return {c["id"]: c["item_count"] for c in partition.list_collections()}
+
+
+def test_put_item_adds_edits_and_moves(partition):
+    partition.item_index()
+    partition.put_item(make_item("1", "a", ["x"]))
+    partition.put_item(make_item("2", "a"))
+    partition.put_item(make_item("1", "a", ["y"], name="Renamed"))
+    assert counts(partition) == {"a": 2, "b": 0}
+    partition.put_item(make_item("2", "b"))
+    assert counts(partition) == {"a": 1, "b": 1}
+    assert partition.get_item("1")["name"] == "Renamed"
+    assert_consistent(partition)
+
+
+def test_moved_items_list_as_the_newest_before_and_after_a_rebuild(partition):
+    partition.add_items("a", [make_item(str(n), "a") for n in range(3)], LATER)
+    partition.add_items("b", [make_item(f"b{n}", "b") for n in range(3)], LATER)
+    partition.item_index()
+    partition.put_item(make_item("0", "b"))
+    partition.put_items([make_item("1", "b"), make_item("2", "b")], LATER)
+    assert ordered_ids(partition.list_items("b")) == ["2", "1", "0", "b2", "b1", "b0"]
+    assert_consistent(partition)
+
+
+def test_collection_edits_keep_the_stored_item_count(partition):
+    collection = partition.get_collection("a")
+    partition.put_item(make_item("1", "a"))
+    partition.put_collection({**collection, "name": "Renamed"})
+    assert partition.get_collection("a")["name"] == "Renamed"
+    assert counts(partition) == {"a": 1, "b": 0}
+    assert_consistent(partition)
+
+
+def test_add_items_counts_the_whole_batch(partition):
+    partition.item_index()
+    items = (make_item(str(n), "a", [f"t{n % 3}"]) for n in range(25))
+    assert partition.add_items("a", items, LATER) == 25
+    assert counts(partition) == {"a": 25, "b": 0}
+    assert_consistent(partition)
+
+
+def test_import_items_writes_off_the_event_loop(partition):
+    partition.item_index()
+    items = (make_item(str(n), "a", ["imported"]) for n in range(25))
+    assert asyncio.run(partition.import_items("a", items, LATER)) == 25
+    assert counts(partition) == {"a": 25, "b": 0}
+    assert_consistent(partition)
+
+
+def test_put_items_moves_and_edits_in_one_write(partition):
+    partition.add_items("a", [make_item(str(n), "a") for n in range(6)], LATER)
+    partition.item_index()
+    moved = [make_item(str(n), "b", ["moved"]) for n in range(4)]
+    edited = [make_item("4", "a", ["edited"])]
+    collections = partition.put_items(moved + edited, LATER)
+    assert {c["id"]: c["item_count"] for c in collections} == {"a": 2, "b": 4}
+    assert counts(partition) == {"a": 2, "b": 4}
+    assert_consistent(partition)
+
+
+def test_update_items_leaves_trashed_items_in_the_trash(partition):
+    partition.add_items("a", [make_item(str(n), "a") for n in range(3)], LATER)
+    partition.item_index()
+    partition.delete_item("0", LATER)
+    edits = [make_item(str(n), "a", ["edited"], name="Edited") for n in range(3)]
+    partition.update_items(edits, LATER)
+    assert partition.get_item("0") is None
+    assert partition.get_item("1")["tags"] == ["edited"]
+    assert counts(partition) == {"a": 2, "b": 0}
+    assert_consistent(partition)
+
+
+def test_delete_and_restore_items(partition):
+    partition.add_items("a", [make_item(str(n), "a", ["x"]) for n in range(5)], LATER)
+    partition.item_index()
+    assert partition.delete_item("0", LATER)["item_count"] == 4
+    assert partition.delete_item("0", LATER) is None
+    partition.delete_items(["1", "2", "missing"], LATER)
+    assert counts(partition) == {"a": 2, "b": 0}
+    assert_consistent(partition)
+    assert partition.restore_item("1", LATER)["item_count"] == 3
+    assert partition.restore_item("1", LATER) is None
+    assert counts(partition) == {"a": 3, "b": 0}
+    assert_consistent(partition)
+
+
+def test_delete_and_restore_collection(partition):
+    partition.add_items("a", [make_item(str(n), "a", ["x"]) for n in range(5)], LATER)
+    partition.delete_item("0", LATER)
+    partition.item_index()
+    partition.delete_collection("a", LATER)
+    assert counts(partition) == {"b": 0}
+    assert partition.list_items() == []
+    assert [e["id"] for e in partition.list_trash()] == ["a"]
+    assert partition.restore_collection("a")
+    assert counts(partition) == {"a": 4, "b": 0}
+    assert_consistent(partition)
+
+
+def test_reconcile_repairs_drifted_counts(repository, partition):
+    partition.add_items("a", [make_item(str(n), "a") for n in range(3)], LATER)
+    repository._conn.execute("UPDATE collections SET item_count = 7 WHERE id = 'a'")
+    version = partition.version
+    assert repository.reconcile_item_counts() == 1
+    assert partition.version == version + 1
+    assert repository.reconcile_item_counts() == 0
+    assert counts(partition) == {"a": 3, "b": 0}
+    assert_consistent(partition)
+
+
+def test_reconcile_reads_from_a_separate_connection(tmp_path):
+    repository = SQLiteRepository(str(tmp_path / "collections.db"))
+    partition = repository.partition(USER)
+    partition.put_collection(make_collection("a"))
+    partition.add_items("a", [make_item(str(n), "a") for n in range(3)], LATER)
+    with repository._conn:
+        repository._conn.execute("UPDATE collections SET item_count = 0")
+    assert repository.reconcile_item_counts() == 1
+    assert counts(partition) == {"a": 3}
+    assert_consistent(partition)
+
+
+def test_purge_removes_trashed_items_and_collections(repository, partition):
+    partition.add_items("a", [make_item(str(n), "a") for n in range(5)], LATER)
+    partition.add_items("b", [make_item(f"b{n}", "b") for n in range(3)], LATER)
+    partition.delete_items(["b0", "b1"], LATER)
+    partition.delete_collection("a", LATER)
+    partition.item_index()
+    version = partition.version
+    assert repository.purge_deleted(PURGE_BEFORE, batch_size=2) == 3
+    assert partition.version > version
+    assert partition.list_trash() == []
+    assert not partition.restore_collection("a")
+    assert partition.restore_item("b0", LATER) is None
+    assert counts(partition) == {"b": 1}
+    assert_consistent(partition)
+
+
+def test_restore_after_a_partial_purge_recounts_items(repository, partition):
+    partition.add_items("a", [make_item(str(n), "a") for n in range(5)], LATER)
+    partition.delete_collection("a", LATER)
+    # What a purge batch leaves behind when the restore lands mid-purge.
+    with repository._conn:
+        repository._conn.execute(
+            "DELETE FROM items WHERE rowid IN "
+            "(SELECT rowid FROM items WHERE collection_id = 'a' LIMIT 2)"
+        )
+    assert partition.restore_collection("a")
+    assert counts(partition) == {"a": 3, "b": 0}
+    assert repository.purge_deleted(PURGE_BEFORE) == 0
+    assert_consistent(partition)
+
+
+def test_purge_spares_a_collection_trashed_again_after_the_cutoff(
+    repository, partition, monkeypatch
+):
+    partition.add_items("a", [make_item(str(n), "a") for n in range(5)], LATER)
+    partition.delete_collection("a", LATER)
+    bump = repository._bump_partition
+
+    def restore_and_trash_again(user_email):
+        # What a restore and a second delete between two purge batches leave.
+        repository._conn.execute(
+            "UPDATE collections SET deleted_at = ? WHERE id = 'a'", (PURGE_BEFORE,)
+        )
+        bump(user_email)
+
+    monkeypatch.setattr(repository, "_bump_partition", restore_and_trash_again)
+    assert repository.purge_deleted("2099-01-01T00:00:00+00:00", batch_size=2) == 0
+    monkeypatch.undo()
+    assert partition.restore_collection("a")
+    assert counts(partition) == {"a": 3, "b": 0}
+    assert_consistent(partition)
+
+
+def test_import_records_recounts_items(partition):
+    imported = partition.import_records(
+        [make_collection("c")], [make_item(str(n), "c") for n in range(4)]
+    )
+    assert imported == 5
+    assert partition.import_records([make_collection("c")], []) == 0
+    assert counts(partition)["c"] == 4
+    assert_consistent(partition)
+
+
+def test_index_follows_writes_from_another_worker(repository, partition):
+    partition.add_items("a", [make_item(str(n), "a") for n in range(3)], LATER)
+    partition.item_index()
+    # A write that bypasses the partition, as another worker's would.
+    repository.put_item(USER, make_item("9", "b", ["elsewhere"]))
+    partition.put_item(make_item("0", "b"))
+    assert counts(partition) == {"a": 2, "b": 2}
+    assert_consistent(partition)